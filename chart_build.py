@@ -0,0 +1,253 @@
+# Batch Chart Builder
+# Author: Ajay Mondal
+# Technologies: Python, Plotly (HTML/PDF), Kaleido, multiprocessing
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import chart_render
+import chart_sources
+
+# Bump when rendering changes so every chart is rebuilt once
+BUILD_VERSION = 2
+
+CHART_FORMATS = ['png', 'svg', 'pdf', 'html']
+MANIFEST_NAME = '.chart_hashes.json'
+
+# Drawn by chart_render in milliseconds; Plotly is only loaded for HTML and PDF
+NATIVE_FORMATS = ['png', 'svg']
+
+# Defaults matching the original portfolio chart
+DEFAULT_COLORS = ['#1FB8CD', '#FFC185', '#ECEBD5', '#5D878F']
+
+
+def load_spec(path):
+    with open(path, encoding='utf-8') as f:
+        spec = json.load(f)
+    spec.setdefault('output', os.path.splitext(os.path.basename(path))[0])
+    return spec
+
+
+def spec_fingerprint(spec_path, source):
+    """Changes to the spec file or the source's files mean the chart may be stale"""
+    return chart_sources.file_fingerprint(spec_path) + source.fingerprint()
+
+
+def chart_hash(spec, data, fmt):
+    """Content hash of everything that affects the rendered file"""
+    content = json.dumps({'spec': spec, 'data': data, 'format': fmt, 'version': BUILD_VERSION},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def build_figure(spec, data):
+    """Plotly figure for a bar, line or pie chart spec"""
+    import plotly.graph_objects as go
+
+    kind = spec.get('type', 'bar')
+    # Colors repeat when there are more categories than colors
+    palette = spec.get('colors', DEFAULT_COLORS)
+    colors = [palette[i % len(palette)] for i in range(len(data['x']))]
+    if kind == 'pie':
+        trace = go.Pie(labels=data['x'], values=data['y'], marker=dict(colors=colors))
+    elif kind == 'line':
+        trace = go.Scatter(x=data['x'], y=data['y'], mode='lines+markers',
+                           line=dict(color=palette[0]), cliponaxis=False)
+    else:
+        trace = go.Bar(x=data['x'], y=data['y'], marker=dict(color=colors), cliponaxis=False)
+    if spec.get('hover'):
+        trace.hovertemplate = spec['hover']
+
+    fig = go.Figure(data=[trace])
+    fig.update_layout(title=spec.get('title'), showlegend=kind == 'pie')
+    if kind != 'pie':
+        fig.update_layout(xaxis_title=spec.get('x_title'), yaxis_title=spec.get('y_title'))
+        if spec.get('y_range'):
+            fig.update_layout(yaxis=dict(range=spec['y_range']))
+    return fig
+
+
+def init_renderer(images=True):
+    """Start one Kaleido renderer per worker and keep it warm for every chart"""
+    if not images:
+        # Native and HTML output don't need a renderer
+        return
+
+    import plotly.graph_objects as go
+
+    try:
+        import kaleido
+        # Kaleido 1.x starts a browser per image unless a sync server is running
+        kaleido.start_sync_server(silence_warnings=True)
+    except (ImportError, AttributeError):
+        # Kaleido 0.2 keeps its renderer process alive on its own
+        pass
+
+    # Pay the renderer start-up once, before the first real chart
+    try:
+        go.Figure().to_image(format='pdf', width=10, height=10)
+    except Exception:
+        pass
+
+
+def render_chart(job):
+    """Worker entry point: render one chart to its output file"""
+    spec, data, path, fmt = job
+    if fmt in NATIVE_FORMATS:
+        chart_render.write_chart(spec, data, path, fmt)
+        return path
+
+    fig = build_figure(spec, data)
+    if fmt == 'html':
+        fig.write_html(path, include_plotlyjs='cdn')
+    else:
+        fig.write_image(path, format=fmt)
+    return path
+
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def plan_builds(spec_dir, output_dir, formats, manifest, force=False, names=None):
+    """Charts whose spec, data or format changed since the last build
+
+    Unchanged fingerprints skip a chart without reading its data; otherwise the
+    data is loaded and only a different content hash triggers a render.
+    """
+    jobs = []
+    skipped = 0
+    failed = []
+    for name in sorted(os.listdir(spec_dir)):
+        if not name.endswith('.json') or (names and name[:-5] not in names):
+            continue
+        spec_path = os.path.join(spec_dir, name)
+        try:
+            spec = load_spec(spec_path)
+            source = chart_sources.get_source(spec, spec_dir)
+            fingerprint = spec_fingerprint(spec_path, source)
+            data = None
+            for fmt in formats:
+                path = os.path.join(output_dir, f"{spec['output']}.{fmt}")
+                entry = manifest.get(os.path.basename(path))
+                up_to_date = not force and isinstance(entry, dict) and os.path.exists(path)
+                if up_to_date and entry['fingerprint'] == fingerprint:
+                    skipped += 1
+                    continue
+
+                if data is None:
+                    data = source.load()
+                digest = chart_hash(spec, data, fmt)
+                if up_to_date and entry['hash'] == digest:
+                    # Touched but not changed
+                    entry['fingerprint'] = fingerprint
+                    skipped += 1
+                    continue
+                jobs.append(((spec, data, path, fmt), digest, fingerprint))
+        except Exception as e:
+            failed.append((spec_path, e))
+    return jobs, skipped, failed
+
+
+def build_charts(spec_dir, output_dir, formats=('png',), workers=None, force=False, names=None):
+    """Render every changed chart spec in spec_dir into output_dir
+
+    names limits the build to those spec names (file names without .json).
+    Returns a dict with rendered/skipped/failed counts and the elapsed time.
+    """
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    jobs, skipped, failed = plan_builds(spec_dir, output_dir, formats, manifest, force, names)
+
+    rendered = 0
+    if jobs:
+        # Kaleido is only needed for PDF; native charts take milliseconds,
+        # so a pool only pays off when Plotly is doing the work
+        images = any(job[3] == 'pdf' for job, digest, fingerprint in jobs)
+        if workers is None and all(job[3] in NATIVE_FORMATS for job, digest, fingerprint in jobs):
+            workers = 1
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        if workers == 1:
+            # A pool isn't worth starting for one renderer
+            init_renderer(images)
+            outcomes = []
+            for job, digest, fingerprint in jobs:
+                try:
+                    render_chart(job)
+                    outcomes.append((job, digest, fingerprint, None))
+                except Exception as e:
+                    outcomes.append((job, digest, fingerprint, e))
+        else:
+            outcomes = []
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_renderer,
+                                     initargs=(images,)) as pool:
+                futures = {pool.submit(render_chart, job): (job, digest, fingerprint)
+                           for job, digest, fingerprint in jobs}
+                for future in as_completed(futures):
+                    outcomes.append(futures[future] + (future.exception(),))
+
+        for (spec, data, path, fmt), digest, fingerprint, error in outcomes:
+            if error is None:
+                manifest[os.path.basename(path)] = {'hash': digest, 'fingerprint': fingerprint}
+                rendered += 1
+            else:
+                failed.append((path, error))
+    save_manifest(output_dir, manifest)
+
+    return {
+        'rendered': rendered,
+        'skipped': skipped,
+        'failed': failed,
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a directory of chart specs, skipping unchanged charts")
+    parser.add_argument('specs', nargs='?', default='charts', help="directory of .json chart specs")
+    parser.add_argument('--output', default='chart_output', help="output directory")
+    parser.add_argument('--formats', nargs='+', choices=CHART_FORMATS, default=['png'])
+    parser.add_argument('--workers', type=int, help="renderer processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="rebuild even if nothing changed")
+    parser.add_argument('--only', nargs='+', metavar='NAME', help="only these specs (names without .json)")
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                        help="keep running and rebuild charts whose spec or sources change")
+    args = parser.parse_args(argv)
+
+    while True:
+        result = build_charts(args.specs, args.output, args.formats, args.workers, args.force, args.only)
+        for path, error in result['failed']:
+            print(f"❌ {path}: {error}")
+        if result['rendered'] or result['failed'] or not args.watch:
+            print(f"✅ {result['rendered']} charts rendered, {result['skipped']} unchanged, "
+                  f"{len(result['failed'])} failed in {result['seconds']}s")
+        if not args.watch:
+            break
+        args.force = False
+        time.sleep(args.watch)
+
+
+if __name__ == '__main__':
+    main()
+
+# To build the charts:
+# 1. PNG and SVG need nothing else; for HTML and PDF: pip install plotly kaleido
+# 2. Put chart specs (.json) in charts/, with data from a source (see chart_sources.py)
+# 3. Run: python chart_build.py charts --output chart_output --formats png
+# 4. Or keep charts fresh: python chart_build.py charts --watch 1
@@ -0,0 +1,362 @@
+# Native SVG/PNG Renderer for Simple Charts
+# Author: Ajay Mondal
+# Technologies: Python, zlib
+
+import math
+import struct
+import zlib
+from xml.sax.saxutils import escape
+
+WIDTH = 800
+HEIGHT = 500
+
+# Plotly's default look, so native and Plotly output match
+BACKGROUND = '#FFFFFF'
+PLOT_BACKGROUND = '#E5ECF6'
+GRID_COLOR = '#FFFFFF'
+TEXT_COLOR = '#2A3F5F'
+FONT_FAMILY = '"Open Sans", verdana, arial, sans-serif'
+TITLE_SIZE = 18
+LABEL_SIZE = 12
+DEFAULT_COLORS = ['#1FB8CD', '#FFC185', '#ECEBD5', '#5D878F']
+
+# Room around the plot area: left, top, right, bottom
+MARGINS = (80, 60, 30, 80)
+
+# Bars fill this share of their category band, like Plotly's default bargap
+BAR_FILL = 0.8
+
+# 5x7 bitmap font for PNG text, ASCII 32-126, five column bytes per glyph (bit 0 = top row)
+FONT = bytes.fromhex(''.join((
+    '0000000000 00005f0000 0007000700 147f147f14 242a7f2a12 2313086462 3649552250 0005030000 '
+    '001c224100 0041221c00 082a1c2a08 08083e0808 0050300000 0808080808 0060600000 2010080402 '
+    '3e5149453e 00427f4000 4261514946 2141454b31 1814127f10 2745454539 3c4a494930 0171090503 '
+    '3649494936 064949291e 0036360000 0056360000 0008142241 1414141414 4122140800 0201510906 '
+    '324979413e 7e1111117e 7f49494936 3e41414122 7f4141221c 7f49494941 7f09090101 3e41415132 '
+    '7f0808087f 00417f4100 2040413f01 7f08142241 7f40404040 7f0204027f 7f0408107f 3e4141413e '
+    '7f09090906 3e4151215e 7f09192946 4649494931 01017f0101 3f4040403f 1f2040201f 7f2018207f '
+    '6314081463 0304780403 6151494543 00007f4141 0204081020 41417f0000 0402010204 4040404040 '
+    '0001020400 2054545478 7f48444438 3844444420 384444487f 3854545418 087e090102 081454543c '
+    '7f08040478 00447d4000 2040443d00 007f102844 00417f4000 7c04180478 7c08040478 3844444438 '
+    '7c14141408 081414187c 7c08040408 4854545420 043f444020 3c4040207c 1c2040201c 3c4030403c '
+    '4428102844 0c5050503c 4464544c44 0008364100 00007f0000 0041360800 0201020402'
+).split()))
+GLYPH_WIDTH = 5
+GLYPH_HEIGHT = 7
+
+
+# Layout
+
+def nice_step(span, ticks=5):
+    """Tick spacing of 1, 2, 2.5 or 5 times a power of ten giving about `ticks` ticks"""
+    raw = span / ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for multiple in (1, 2, 2.5, 5, 10):
+        if raw <= multiple * magnitude:
+            return multiple * magnitude
+    return 10 * magnitude
+
+
+def value_axis(values, value_range=None):
+    """(low, high, ticks) for the value axis, honouring an explicit range"""
+    if value_range:
+        low, high = value_range
+    else:
+        low = min([0] + list(values))
+        high = max([0] + list(values)) or 1
+    step = nice_step(high - low)
+    if not value_range:
+        low = math.floor(low / step) * step
+        high = math.ceil(high / step) * step
+    first = math.ceil(low / step) * step
+    ticks = []
+    tick = first
+    while tick <= high + step * 1e-9:
+        ticks.append(round(tick, 10))
+        tick += step
+    return low, high, ticks
+
+
+def format_number(value):
+    return f'{value:g}' if abs(value) < 1e6 else f'{value:.3g}'
+
+
+def text_width(text, size):
+    """Approximate rendered width; exact for the bitmap font"""
+    scale = font_scale(size)
+    return len(text) * (GLYPH_WIDTH + 1) * scale
+
+
+def font_scale(size):
+    return 1 if size < 12 else 2 if size < 20 else 3
+
+
+def fit_label(text, width, size):
+    """Shorten a category label to fit its band"""
+    text = str(text)
+    if text_width(text, size) <= width:
+        return text
+    keep = max(1, int(width / text_width('x', size)) - 2)
+    return text[:keep] + '..'
+
+
+def build_scene(spec, data, width=WIDTH, height=HEIGHT):
+    """Describe a chart as shapes and text shared by the SVG and PNG writers"""
+    palette = spec.get('colors') or DEFAULT_COLORS
+    labels = [str(label) for label in data['x']]
+    values = [float(value) for value in data['y']]
+    colors = [palette[i % len(palette)] for i in range(len(labels))]
+    left, top, right, bottom = MARGINS
+    plot_width = width - left - right
+    plot_height = height - top - bottom
+
+    scene = [('rect', 0, 0, width, height, BACKGROUND)]
+    if spec.get('title'):
+        scene.append(('text', left, top / 2, spec['title'], TITLE_SIZE, TEXT_COLOR, 'start', False))
+
+    if spec.get('type') == 'pie':
+        return scene + pie_shapes(labels, values, colors, left, top, plot_width, plot_height)
+
+    low, high, ticks = value_axis(values, spec.get('y_range'))
+    scale = plot_height / (high - low)
+
+    def y_of(value):
+        value = min(max(value, low), high)
+        return top + plot_height - (value - low) * scale
+
+    scene.append(('rect', left, top, plot_width, plot_height, PLOT_BACKGROUND))
+    for tick in ticks:
+        scene.append(('line', [(left, y_of(tick)), (left + plot_width, y_of(tick))], GRID_COLOR, 1))
+        scene.append(('text', left - 8, y_of(tick), format_number(tick), LABEL_SIZE, TEXT_COLOR, 'end', False))
+
+    band = plot_width / max(1, len(labels))
+    centers = [left + band * (i + 0.5) for i in range(len(labels))]
+    if spec.get('type') == 'line':
+        points = [(x, y_of(value)) for x, value in zip(centers, values)]
+        scene.append(('line', points, palette[0], 2))
+        for x, y in points:
+            scene.append(('circle', x, y, 4, palette[0]))
+    else:
+        bar_width = band * BAR_FILL
+        for x, value, color in zip(centers, values, colors):
+            y_top, y_base = sorted((y_of(value), y_of(max(low, 0))))
+            scene.append(('rect', x - bar_width / 2, y_top, bar_width, y_base - y_top, color))
+
+    for x, label in zip(centers, labels):
+        scene.append(('text', x, top + plot_height + 16, fit_label(label, band - 4, LABEL_SIZE),
+                      LABEL_SIZE, TEXT_COLOR, 'middle', False))
+    if spec.get('x_title'):
+        scene.append(('text', left + plot_width / 2, height - 24, spec['x_title'], LABEL_SIZE + 2,
+                      TEXT_COLOR, 'middle', False))
+    if spec.get('y_title'):
+        scene.append(('text', 22, top + plot_height / 2, spec['y_title'], LABEL_SIZE + 2,
+                      TEXT_COLOR, 'middle', True))
+    return scene
+
+
+def pie_shapes(labels, values, colors, left, top, plot_width, plot_height):
+    """Wedges clockwise from 12 o'clock, percentages inside and a legend on the right"""
+    shapes = []
+    total = sum(value for value in values if value > 0) or 1
+    radius = min(plot_width * 0.6, plot_height) / 2
+    cx = left + plot_width * 0.35
+    cy = top + plot_height / 2
+
+    slices = []
+    angle = 0.0
+    for value, color in zip(values, colors):
+        if value <= 0:
+            continue
+        sweep = 2 * math.pi * value / total
+        slices.append((angle, angle + sweep, color))
+        if value / total >= 0.04:
+            middle = angle + sweep / 2
+            shapes.append(('text', cx + math.sin(middle) * radius * 0.65, cy - math.cos(middle) * radius * 0.65,
+                           f'{value / total * 100:.1f}%', LABEL_SIZE, TEXT_COLOR, 'middle', False))
+        angle += sweep
+    # Wedges go first so the percentages are drawn on top
+    shapes.insert(0, ('pie', cx, cy, radius, slices))
+
+    legend_x = left + plot_width * 0.75
+    for index, (label, color) in enumerate(zip(labels, colors)):
+        y = top + 20 + index * 24
+        shapes.append(('rect', legend_x, y - 6, 12, 12, color))
+        shapes.append(('text', legend_x + 20, y, label, LABEL_SIZE, TEXT_COLOR, 'start', False))
+    return shapes
+
+
+# SVG
+
+def render_svg(spec, data, width=WIDTH, height=HEIGHT):
+    """Chart as an SVG document"""
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'viewBox="0 0 {width} {height}" font-family=\'{FONT_FAMILY}\'>']
+    for shape in build_scene(spec, data, width, height):
+        kind = shape[0]
+        if kind == 'rect':
+            _, x, y, w, h, color = shape
+            parts.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{w:.1f}" height="{h:.1f}" fill="{color}"/>')
+        elif kind == 'line':
+            _, points, color, line_width = shape
+            coords = ' '.join(f'{x:.1f},{y:.1f}' for x, y in points)
+            parts.append(f'<polyline points="{coords}" fill="none" stroke="{color}" stroke-width="{line_width}"/>')
+        elif kind == 'circle':
+            _, x, y, r, color = shape
+            parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{r}" fill="{color}"/>')
+        elif kind == 'pie':
+            _, cx, cy, r, slices = shape
+            parts.extend(svg_wedge(cx, cy, r, start, end, color) for start, end, color in slices)
+        elif kind == 'text':
+            _, x, y, text, size, color, anchor, vertical = shape
+            rotate = f' transform="rotate(-90 {x:.1f} {y:.1f})"' if vertical else ''
+            parts.append(f'<text x="{x:.1f}" y="{y:.1f}" font-size="{size}" fill="{color}" '
+                         f'text-anchor="{anchor}" dominant-baseline="middle"{rotate}>{escape(str(text))}</text>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def svg_wedge(cx, cy, r, start, end, color):
+    if end - start >= 2 * math.pi - 1e-9:
+        return f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{r:.1f}" fill="{color}"/>'
+    x1, y1 = cx + r * math.sin(start), cy - r * math.cos(start)
+    x2, y2 = cx + r * math.sin(end), cy - r * math.cos(end)
+    large = 1 if end - start > math.pi else 0
+    return (f'<path d="M{cx:.1f},{cy:.1f} L{x1:.1f},{y1:.1f} A{r:.1f},{r:.1f} 0 {large} 1 {x2:.1f},{y2:.1f} Z" '
+            f'fill="{color}" stroke="#FFFFFF" stroke-width="1"/>')
+
+
+# PNG
+
+def parse_color(color):
+    color = color.lstrip('#')
+    if len(color) == 3:
+        color = ''.join(c * 2 for c in color)
+    return bytes.fromhex(color[:6])
+
+
+class Canvas:
+    """RGB pixel buffer with the few primitives the charts need"""
+
+    def __init__(self, width, height, background=BACKGROUND):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(parse_color(background) * (width * height))
+
+    def fill_rect(self, x, y, w, h, rgb):
+        x0, y0 = max(0, int(round(x))), max(0, int(round(y)))
+        x1, y1 = min(self.width, int(round(x + w))), min(self.height, int(round(y + h)))
+        if x1 <= x0 or y1 <= y0:
+            return
+        span = rgb * (x1 - x0)
+        for row in range(y0, y1):
+            start = (row * self.width + x0) * 3
+            self.pixels[start:start + len(span)] = span
+
+    def line(self, points, rgb, width):
+        half = width / 2
+        for (xa, ya), (xb, yb) in zip(points, points[1:]):
+            if ya == yb or xa == xb:
+                self.fill_rect(min(xa, xb) - (half if xa == xb else 0), min(ya, yb) - (half if ya == yb else 0),
+                               abs(xb - xa) or width, abs(yb - ya) or width, rgb)
+                continue
+            steps = int(max(abs(xb - xa), abs(yb - ya))) + 1
+            for step in range(steps + 1):
+                t = step / steps
+                self.fill_rect(xa + (xb - xa) * t - half, ya + (yb - ya) * t - half, width, width, rgb)
+
+    def circle(self, cx, cy, r, rgb):
+        for dy in range(-int(r), int(r) + 1):
+            dx = math.sqrt(max(0, r * r - dy * dy))
+            self.fill_rect(cx - dx, cy + dy, 2 * dx, 1, rgb)
+
+    def pie(self, cx, cy, r, slices):
+        """Fill pie slices row by row, splitting each row where the slice edges cross it"""
+        slices = [(start, end, parse_color(color)) for start, end, color in slices]
+        for dy in range(-int(r), int(r) + 1):
+            half = math.sqrt(max(0, r * r - dy * dy))
+            cuts = [cx - half, cx, cx + half]
+            for start, end, rgb in slices:
+                # Each slice edge is a ray from the centre towards (sin a, -cos a)
+                cos_a = math.cos(start)
+                if dy == 0 or abs(cos_a) < 1e-12 or -dy / cos_a <= 0:
+                    continue
+                x = cx - dy * math.tan(start)
+                if cx - half < x < cx + half:
+                    cuts.append(x)
+            cuts.sort()
+            for a, b in zip(cuts, cuts[1:]):
+                if b - a <= 0:
+                    continue
+                angle = math.atan2((a + b) / 2 - cx, -dy) % (2 * math.pi)
+                for start, end, rgb in slices:
+                    if start <= angle < end:
+                        self.fill_rect(a, cy + dy, b - a, 1, rgb)
+                        break
+
+    def text(self, x, y, text, size, rgb, anchor='start', vertical=False):
+        scale = font_scale(size)
+        length = text_width(text, size) - scale
+        offset = {'start': 0, 'middle': length / 2, 'end': length}[anchor]
+        for index, char in enumerate(text):
+            code = ord(char) if 32 <= ord(char) <= 126 else ord('?')
+            columns = FONT[(code - 32) * GLYPH_WIDTH:(code - 31) * GLYPH_WIDTH]
+            for column, bits in enumerate(columns):
+                along = (index * (GLYPH_WIDTH + 1) + column) * scale - offset
+                for row in range(GLYPH_HEIGHT):
+                    if bits >> row & 1:
+                        across = row * scale - GLYPH_HEIGHT * scale / 2
+                        if vertical:
+                            self.fill_rect(x + across, y - along - scale, scale, scale, rgb)
+                        else:
+                            self.fill_rect(x + along, y + across, scale, scale, rgb)
+
+    def to_png(self):
+        """Encode as an 8-bit RGB PNG"""
+        stride = self.width * 3
+        raw = b''.join(b'\x00' + bytes(self.pixels[row * stride:(row + 1) * stride])
+                       for row in range(self.height))
+
+        def chunk(kind, body):
+            return (struct.pack('>I', len(body)) + kind + body
+                    + struct.pack('>I', zlib.crc32(kind + body) & 0xffffffff))
+
+        header = struct.pack('>IIBBBBB', self.width, self.height, 8, 2, 0, 0, 0)
+        return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+                + chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b''))
+
+
+def render_png(spec, data, width=WIDTH, height=HEIGHT):
+    """Chart as PNG bytes"""
+    canvas = Canvas(width, height)
+    for shape in build_scene(spec, data, width, height):
+        kind = shape[0]
+        if kind == 'rect':
+            _, x, y, w, h, color = shape
+            canvas.fill_rect(x, y, w, h, parse_color(color))
+        elif kind == 'line':
+            _, points, color, line_width = shape
+            canvas.line(points, parse_color(color), line_width)
+        elif kind == 'circle':
+            _, x, y, r, color = shape
+            canvas.circle(x, y, r, parse_color(color))
+        elif kind == 'pie':
+            _, cx, cy, r, slices = shape
+            canvas.pie(cx, cy, r, slices)
+        elif kind == 'text':
+            _, x, y, text, size, color, anchor, vertical = shape
+            canvas.text(x, y, str(text), size, parse_color(color), anchor, vertical)
+    return canvas.to_png()
+
+
+def write_chart(spec, data, path, fmt):
+    """Write a bar, line or pie chart as .svg or .png"""
+    width = spec.get('width', WIDTH)
+    height = spec.get('height', HEIGHT)
+    if fmt == 'svg':
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_svg(spec, data, width, height))
+    elif fmt == 'png':
+        with open(path, 'wb') as f:
+            f.write(render_png(spec, data, width, height))
+    else:
+        raise ValueError(f"Native renderer can't write {fmt}")
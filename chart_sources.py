@@ -0,0 +1,154 @@
+# Data Sources for Chart Specs
+# Author: Ajay Mondal
+# Technologies: Python, SQLite, JSON, CSV
+
+import csv
+import json
+import os
+
+
+def file_fingerprint(*paths):
+    """Cheap change marker: modification time and size of each file that exists"""
+    marks = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            marks.append([os.path.basename(path), stat.st_mtime_ns, stat.st_size])
+        except FileNotFoundError:
+            marks.append([os.path.basename(path), None, None])
+    return marks
+
+
+class InlineSource:
+    """Data written into the spec itself: {"x": [...], "y": [...]}"""
+
+    def __init__(self, config, spec_dir):
+        self.data = config['data']
+
+    def fingerprint(self):
+        # Part of the spec, so the spec's own fingerprint covers it
+        return []
+
+    def load(self):
+        return self.data
+
+
+class FileSource:
+    """A two-column CSV with a header, or a JSON file
+
+    JSON files either hold {"x": [...], "y": [...]} or a list of records picked
+    with "records", "x" and "y" keys, e.g. the projects in data/projects.json.
+    """
+
+    def __init__(self, config, spec_dir):
+        self.path = os.path.join(spec_dir, config['path'])
+        self.config = config
+
+    def fingerprint(self):
+        return file_fingerprint(self.path)
+
+    def load(self):
+        if not self.path.lower().endswith('.json'):
+            with open(self.path, newline='', encoding='utf-8') as f:
+                rows = list(csv.reader(f))[1:]
+            return {'x': [row[0] for row in rows], 'y': [float(row[1]) for row in rows]}
+
+        with open(self.path, encoding='utf-8') as f:
+            content = json.load(f)
+        if 'records' not in self.config:
+            return content
+        records = content[self.config['records']]
+        return {
+            'x': [record[self.config.get('x', 'x')] for record in records],
+            'y': [record[self.config.get('y', 'y')] for record in records],
+        }
+
+
+class SqliteSource:
+    """Aggregates from the student database's summary tables
+
+    aggregate is one of 'courses', 'years', 'attendance_histogram' or 'grade_histogram'.
+    """
+
+    AGGREGATES = ['courses', 'years', 'attendance_histogram', 'grade_histogram']
+
+    def __init__(self, config, spec_dir):
+        import student_db
+
+        self.path = os.path.join(spec_dir, config.get('db', os.path.relpath(student_db.DB_PATH, spec_dir)))
+        self.aggregate = config['aggregate']
+        if self.aggregate not in self.AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {self.aggregate}")
+
+    def fingerprint(self):
+        # Committed writes land in the WAL first, so watch both files
+        return file_fingerprint(self.path, self.path + '-wal')
+
+    def load(self):
+        import student_db
+        from student_reports import open_read_only
+
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Student database not found: {self.path}")
+        conn = open_read_only(self.path)
+        try:
+            if self.aggregate == 'courses':
+                rows = student_db.get_course_counts(conn)
+            elif self.aggregate == 'years':
+                rows = [(f'Year {year}', count) for year, count in student_db.get_year_counts(conn)]
+            else:
+                metric = self.aggregate.split('_')[0]
+                edges = student_db.histogram_edges(metric)
+                counts = student_db.get_histogram(conn, metric)
+                rows = [(f'{low:g}-{high:g}', count) for low, high, count in zip(edges, edges[1:], counts)]
+        finally:
+            conn.close()
+        return {'x': [str(label) for label, _ in rows], 'y': [count for _, count in rows]}
+
+
+class MetricsSource:
+    """Numbers from a JSON metrics file such as the price predictor's model_metrics.json
+
+    "field" picks a nested {name: value} object; "keys" picks top-level values.
+    """
+
+    def __init__(self, config, spec_dir):
+        self.path = os.path.join(spec_dir, config['path'])
+        self.field = config.get('field')
+        self.keys = config.get('keys')
+
+    def fingerprint(self):
+        return file_fingerprint(self.path)
+
+    def load(self):
+        with open(self.path, encoding='utf-8') as f:
+            metrics = json.load(f)
+        values = metrics[self.field] if self.field else {key: metrics[key] for key in self.keys}
+        return {'x': list(values), 'y': list(values.values())}
+
+
+SOURCES = {
+    'inline': InlineSource,
+    'file': FileSource,
+    'sqlite': SqliteSource,
+    'metrics': MetricsSource,
+}
+
+
+def get_source(spec, spec_dir):
+    """The data source a chart spec asks for
+
+    Specs name it under "source": {"type": ...}; the older "data" and
+    "data_file" keys still work.
+    """
+    if 'source' in spec:
+        config = spec['source']
+    elif 'data_file' in spec:
+        config = {'type': 'file', 'path': spec['data_file']}
+    else:
+        config = {'type': 'inline', 'data': spec['data']}
+
+    source_type = config.get('type')
+    if source_type not in SOURCES:
+        raise ValueError(f"Unknown chart source: {source_type}")
+    return SOURCES[source_type](config, spec_dir)
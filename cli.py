@@ -0,0 +1,76 @@
+# Command-Line Entry Point for the Portfolio Projects
+# Author: Ajay Mondal
+# Technologies: Python, argparse, importlib
+
+import argparse
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# name: (module or .py file, function, help)
+# Modules are only imported when their command runs, so --help stays instant
+COMMANDS = {
+    'train': ('ml-price-predictor.py', 'train_main', "train the house price model and save it"),
+    'serve': ('ml-price-predictor.py', 'serve_main', "serve the house price predictor web app"),
+    'score-file': ('price_scoring', 'main', "score a CSV/Parquet file of listings with the saved model"),
+    'bench': ('student_bench', 'main', "benchmark the student data layer"),
+    'seed-students': ('student_bench', 'seed_main', "fill a student database with synthetic students"),
+    'import': ('student_import', 'main', "import students from CSV, NDJSON or Parquet"),
+    'export': ('student_export', 'main', "export students or changes since a checkpoint"),
+    'report': ('student_reports', 'main', "generate per course/year student reports"),
+    'charts': ('chart_build', 'main', "render chart specs, skipping unchanged charts"),
+    'backup': ('student_backup', 'main', "back up the live student database"),
+    'archive': ('student_archive', 'main', "move old students into an archive database"),
+    'trace': ('tracing', 'main', "summarize a trace written with TRACE=trace.json"),
+}
+
+
+def load_module(name):
+    """Import a module by name, or a script whose file name isn't a valid module name"""
+    if not name.endswith('.py'):
+        import importlib
+        return importlib.import_module(name)
+
+    import importlib.util
+
+    module_name = name[:-3].replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(HERE, name))
+    module = importlib.util.module_from_spec(spec)
+    # Registered before running so pickling and worker processes can find it
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def main(argv=None):
+    commands = '\n'.join(f"  {name:<15}{help_text}" for name, (_, _, help_text) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description="Run the portfolio's tools from one place",
+        epilog=f"commands:\n{commands}\n\nRun 'cli.py COMMAND --help' for a command's options.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('command', choices=COMMANDS, metavar='COMMAND', help="one of the commands below")
+    parser.add_argument('args', nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    # Project modules are imported relative to this file, wherever it's run from
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+
+    module_name, function_name, _ = COMMANDS[args.command]
+    # Subcommand help shows "cli.py export" instead of "cli.py"
+    sys.argv[0] = f'cli.py {args.command}'
+    return getattr(load_module(module_name), function_name)(args.args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# To use the CLI:
+# 1. List commands: python cli.py --help
+# 2. Run one: python cli.py export students.csv, python cli.py charts --formats svg
+# 3. Headless commands (train, score-file, export, report, charts, backup) suit cron and CI
@@ -2,38 +2,40 @@
 # Author: Ajay Mondal
 # Technologies: Python, Flask, Scikit-learn, Pandas, NumPy
 
-from flask import Flask, render_template, request, jsonify
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.linear_regression import LinearRegression
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_absolute_error, r2_score
-import joblib
+import argparse
+import json
 import os
+from datetime import datetime
 
-app = Flask(__name__)
+import price_models
+import tracing
+from price_artifacts import COMPARABLES_PATH, FEATURE_NAMES, MODEL_PATH, SCALER_PATH
+
+# Flask, NumPy, pandas, scikit-learn and joblib are imported where they're
+# used, so cli.py can load this module (e.g. for --help) in milliseconds
+
+# Created by create_app()
+app = None
 
 # Global variables for model and scaler
 model = None
 scaler = None
-feature_names = ['area', 'bedrooms', 'bathrooms', 'age', 'location_score']
-
-def create_sample_data():
-    """Create sample housing data for demonstration"""
-    np.random.seed(42)
-    n_samples = 1000
+model_report = None
+comparables_index = None
+
+# Sample feature ranges (low inclusive, high exclusive), in FEATURE_NAMES order
+SAMPLE_RANGES = {
+    'area': (500, 3000),
+    'bedrooms': (1, 6),
+    'bathrooms': (1, 4),
+    'age': (0, 50),
+    'location_score': (1, 11)  # 1-10 rating
+}
+
+def sample_prices(data, n_samples):
+    """Create realistic price based on features"""
+    import numpy as np
     
-    # Generate synthetic housing data
-    data = {
-        'area': np.random.randint(500, 3000, n_samples),
-        'bedrooms': np.random.randint(1, 6, n_samples),
-        'bathrooms': np.random.randint(1, 4, n_samples),
-        'age': np.random.randint(0, 50, n_samples),
-        'location_score': np.random.randint(1, 11, n_samples)  # 1-10 rating
-    }
-    
-    # Create realistic price based on features
     prices = (
         data['area'] * 150 +  # Rs 150 per sq ft
         data['bedrooms'] * 50000 +  # Rs 50k per bedroom
@@ -42,20 +44,47 @@ def create_sample_data():
         data['age'] * 2000 +  # Depreciation
         np.random.normal(0, 50000, n_samples)  # Random variation
     )
+    return np.maximum(prices, 100000)  # Minimum price 1 lakh
+
+def create_sample_data(n_samples=1000):
+    """Create sample housing data for demonstration"""
+    import numpy as np
+    import pandas as pd
+    
+    np.random.seed(42)
     
-    data['price'] = np.maximum(prices, 100000)  # Minimum price 1 lakh
+    # Generate synthetic housing data
+    data = {name: np.random.randint(low, high, n_samples) for name, (low, high) in SAMPLE_RANGES.items()}
+    data['price'] = sample_prices(data, n_samples)
     
     return pd.DataFrame(data)
 
-def train_model():
-    """Train the machine learning model"""
-    global model, scaler
+def create_sample_array(n_samples=1000, dtype='float64'):
+    """The same sample data as create_sample_data, written straight into one
+    contiguous array with the features in FEATURE_NAMES order and price last"""
+    import numpy as np
     
-    # Create or load data
-    df = create_sample_data()
+    np.random.seed(42)
+    data = np.empty((n_samples, len(FEATURE_NAMES) + 1), dtype=dtype)
+    columns = {}
+    for index, name in enumerate(FEATURE_NAMES):
+        low, high = SAMPLE_RANGES[name]
+        data[:, index] = np.random.randint(low, high, n_samples)
+        columns[name] = data[:, index]
+    data[:, -1] = sample_prices(columns, n_samples)
+    return data
+
+def prepare_frame(df):
+    """Split and scale the DataFrame
+
+    Returns (scaler, X_train, y_train, X_test, y_test, train_ids), where
+    train_ids are the DataFrame index labels of the training rows.
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
     
     # Prepare features and target
-    X = df[feature_names]
+    X = df[FEATURE_NAMES]
     y = df['price']
     
     # Split the data
@@ -67,27 +96,167 @@ def train_model():
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
+    return scaler, X_train_scaled, y_train.to_numpy(), X_test_scaled, y_test.to_numpy(), X_train.index.to_numpy()
+
+def prepare_array(data, test_size=0.2, keep_ids=False):
+    """The same split and scaling on one (rows, features + price) array, without copies
+
+    Rows are shuffled in place so the test and train sets are slices of the
+    same array, and the features are standardised in place, one column at a
+    time so no full-size temporaries are made. With keep_ids the training
+    rows' original row numbers are returned last, otherwise None.
+    """
+    import numpy as np
+    from sklearn.preprocessing import StandardScaler
+    
+    np.random.default_rng(42).shuffle(data)
+    row_ids = None
+    if keep_ids:
+        # The same seed shuffles row numbers exactly like the rows
+        row_ids = np.arange(len(data))
+        np.random.default_rng(42).shuffle(row_ids)
+    n_test = int(len(data) * test_size)
+    features, target = data[:, :-1], data[:, -1]
+    train = slice(n_test, None)
+    
+    # A regular StandardScaler, so serving and batch scoring load it as before
+    scaler = StandardScaler()
+    scaler.mean_ = np.array([features[train, j].mean(dtype=np.float64) for j in range(features.shape[1])])
+    scaler.var_ = np.array([features[train, j].var(dtype=np.float64) for j in range(features.shape[1])])
+    scaler.scale_ = np.where(scaler.var_ > 0, np.sqrt(scaler.var_), 1.0)
+    scaler.n_features_in_ = len(FEATURE_NAMES)
+    scaler.feature_names_in_ = np.array(FEATURE_NAMES, dtype=object)
+    scaler.n_samples_seen_ = len(data) - n_test
+    for j in range(features.shape[1]):
+        features[:, j] -= scaler.mean_[j]
+        features[:, j] /= scaler.scale_[j]
+    train_ids = row_ids[train] if keep_ids else None
+    return scaler, features[train], target[train], features[:n_test], target[:n_test], train_ids
+
+def choose_model(models, p99_budget_ms, X_train, y_train, X_test, y_test):
+    """Benchmark the candidate models and keep the most accurate one within the budget"""
+    with tracing.span('benchmark_models', models=','.join(models)):
+        results, fitted = price_models.benchmark(models, X_train, y_train, X_test, y_test)
+    chosen = price_models.select_model(results, p99_budget_ms)
+    print(price_models.format_table(results, chosen))
+    if chosen['single_p99_ms'] > p99_budget_ms:
+        print(f"⚠️ No model meets the {p99_budget_ms} ms p99 budget; using the fastest")
+    report = {
+        'chosen': chosen['model'],
+        'p99_budget_ms': p99_budget_ms,
+        'train_rows': len(X_train),
+        'test_rows': len(X_test),
+        'results': results,
+    }
+    return fitted[chosen['model']], report
+
+@tracing.traced()
+def train_model(n_samples=1000, lean=False, dtype='float64', models=('linear',),
+                p99_budget_ms=price_models.P99_BUDGET_MS, comparables=False):
+    """Train the machine learning model
+    
+    lean trains on a single array (float32 if asked) instead of a DataFrame
+    and its copies, so several times more rows fit in memory. With several
+    models they are all benchmarked and the most accurate one whose p99
+    single-row latency is within p99_budget_ms is kept. comparables also
+    saves a KD-tree of the training listings for /predict to look up; it
+    holds a float64 copy of the training features, so it is off by default.
+    """
+    global model, scaler, model_report, comparables_index
+    import joblib
+    from sklearn.metrics import mean_absolute_error, r2_score
+    import price_comparables
+    
+    # Create or load data
+    with tracing.span('create_sample_data', rows=n_samples):
+        if lean:
+            data = create_sample_array(n_samples, dtype)
+        else:
+            data = create_sample_data(n_samples)
+    
+    if lean:
+        scaler, X_train, y_train, X_test, y_test, train_ids = prepare_array(data, keep_ids=comparables)
+    else:
+        scaler, X_train, y_train, X_test, y_test, train_ids = prepare_frame(data)
     
-    # Train the model
-    model = LinearRegression()
-    model.fit(X_train_scaled, y_train)
+    report = None
+    if len(models) > 1:
+        model, report = choose_model(models, p99_budget_ms, X_train, y_train, X_test, y_test)
+    else:
+        # Train the model
+        model = price_models.create_model(models[0])
+        if lean and 'copy_X' in model.get_params():
+            model.set_params(copy_X=False)
+        with tracing.span('fit', rows=len(X_train)):
+            model.fit(X_train, y_train)
     
     # Evaluate the model
-    y_pred = model.predict(X_test_scaled)
-    mae = mean_absolute_error(y_test, y_pred)
-    r2 = r2_score(y_test, y_pred)
+    with tracing.span('evaluate', rows=len(X_test)):
+        y_pred = model.predict(X_test)
+        mae = mean_absolute_error(y_test, y_pred)
+        r2 = r2_score(y_test, y_pred)
+        weights = price_models.feature_weights(model, FEATURE_NAMES, X_test, y_test)
+    
+    comparables_index = None
+    if comparables:
+        with tracing.span('build_comparables', rows=len(X_train)):
+            comparables_index = price_comparables.build_index(X_train, y_train, train_ids)
+    del data, X_train, y_train, train_ids
+    peak_rss_mb = tracing.peak_rss_mb()
     
     print(f"Model trained successfully!")
     print(f"Mean Absolute Error: ₹{mae:,.2f}")
     print(f"R² Score: {r2:.3f}")
+    if peak_rss_mb is not None:
+        print(f"Peak memory: {peak_rss_mb} MB for {n_samples:,} rows")
     
     # Save the model and scaler
-    joblib.dump(model, 'house_price_model.pkl')
-    joblib.dump(scaler, 'scaler.pkl')
+    joblib.dump(model, MODEL_PATH)
+    joblib.dump(scaler, SCALER_PATH)
+    if comparables_index is not None:
+        price_comparables.save_index(comparables_index)
+    elif os.path.exists(COMPARABLES_PATH):
+        # Built from an older model's training data
+        os.remove(COMPARABLES_PATH)
+    model_report = report
+    if report:
+        with open(price_models.REPORT_PATH, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif os.path.exists(price_models.REPORT_PATH):
+        # A single model wasn't benchmarked, so an older report no longer applies
+        os.remove(price_models.REPORT_PATH)
+    
+    # Metrics for the chart pipeline (charts/model_feature_weights.json)
+    with open('model_metrics.json', 'w') as f:
+        json.dump({
+            'model': report['chosen'] if report else models[0],
+            'mae': float(mae),
+            'r2': float(r2),
+            'feature_weights': weights,
+            'rows': n_samples,
+            'lean': lean,
+            'peak_rss_mb': peak_rss_mb,
+            'trained_at': datetime.now().isoformat(timespec='seconds')
+        }, f, indent=2)
     
     return mae, r2
 
-@app.route('/')
+def load_model():
+    """Load the saved model and scaler instead of training again"""
+    global model, scaler, model_report, comparables_index
+    import joblib
+    import price_comparables
+    
+    model = joblib.load(MODEL_PATH)
+    scaler = joblib.load(SCALER_PATH)
+    comparables_index = None
+    if os.path.exists(COMPARABLES_PATH):
+        comparables_index = price_comparables.load_index()
+    model_report = None
+    if os.path.exists(price_models.REPORT_PATH):
+        with open(price_models.REPORT_PATH) as f:
+            model_report = json.load(f)
+
 def index():
     """Render the main page"""
     return '''
@@ -452,9 +621,12 @@ def index():
 </html>
     '''
 
-@app.route('/predict', methods=['POST'])
+@tracing.traced()
 def predict():
     """API endpoint for price prediction"""
+    from flask import request, jsonify
+    import price_comparables
+    
     try:
         # Get data from request
         data = request.get_json()
@@ -473,11 +645,21 @@ def predict():
         
         # Make prediction
         prediction = model.predict(features_scaled)[0]
-        
-        return jsonify({
+        result = {
             'success': True,
             'predicted_price': round(prediction, 2)
-        })
+        }
+        
+        # Optional: "comparables": true or a count adds the most similar training listings
+        count = data.get('comparables')
+        if count:
+            if comparables_index is None:
+                raise ValueError("No comparables index; retrain with --comparables to build one")
+            count = price_comparables.DEFAULT_K if count is True else int(count)
+            result['comparables'] = price_comparables.find_comparables(
+                comparables_index, scaler, features_scaled, FEATURE_NAMES, count)[0]
+        
+        return jsonify(result)
         
     except Exception as e:
         return jsonify({
@@ -485,34 +667,92 @@ def predict():
             'error': str(e)
         }), 400
 
-@app.route('/model_info')
 def model_info():
     """Get model information"""
+    from flask import jsonify
+    
+    estimator = model[-1] if hasattr(model, 'steps') else model
     return jsonify({
-        'algorithm': 'Linear Regression',
-        'features': feature_names,
-        'model_trained': model is not None
+        'algorithm': type(estimator).__name__ if model is not None else None,
+        'features': FEATURE_NAMES,
+        'model_trained': model is not None,
+        'comparables': comparables_index is not None,
+        'benchmark': model_report
     })
 
-if __name__ == '__main__':
-    # Train the model when starting the app
-    print("Training ML model...")
-    mae, r2 = train_model()
+def create_app():
+    """The Flask app with the predictor's routes"""
+    global app
+    from flask import Flask
     
+    app = Flask(__name__)
+    app.add_url_rule('/', view_func=index)
+    app.add_url_rule('/predict', view_func=predict, methods=['POST'])
+    app.add_url_rule('/model_info', view_func=model_info)
+    return app
+
+def train_main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the house price model and save it")
+    parser.add_argument('--rows', type=int, default=1000, help="sample rows to train on")
+    parser.add_argument('--lean', action='store_true',
+                        help="train on one array without DataFrame copies (much lower peak memory)")
+    parser.add_argument('--float32', action='store_true', help="with --lean, store the data as float32")
+    parser.add_argument('--models', nargs='+', default=['linear'], metavar='MODEL',
+                        help=f"one model, several to benchmark and pick from, or 'all' ({', '.join(price_models.MODELS)})")
+    parser.add_argument('--p99-budget-ms', type=float, default=price_models.P99_BUDGET_MS,
+                        help="single-row p99 latency the chosen model must meet")
+    parser.add_argument('--comparables', action='store_true',
+                        help="also save a nearest-comparables index (a float64 copy of the training features)")
+    args = parser.parse_args(argv)
+
+    models = list(price_models.MODELS) if args.models == ['all'] else args.models
+    for name in models:
+        if name not in price_models.MODELS:
+            parser.error(f"unknown model: {name}")
+
+    print("Training ML model...")
+    train_model(args.rows, args.lean, 'float32' if args.float32 else 'float64', models,
+                args.p99_budget_ms, args.comparables)
+
+def serve_main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the house price predictor")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--retrain', action='store_true', help="train a fresh model instead of loading the saved one")
+    parser.add_argument('--debug', action='store_true', help="run Flask in debug mode")
+    args = parser.parse_args(argv)
+
+    if args.retrain or not os.path.exists(MODEL_PATH) or not os.path.exists(SCALER_PATH):
+        # Train the model when there is none to load
+        print("Training ML model...")
+        mae, r2 = train_model()
+        print(f"📊 Model Performance:")
+        print(f"   - Mean Absolute Error: ₹{mae:,.2f}")
+        print(f"   - R² Score: {r2:.3f}")
+    else:
+        load_model()
+        print(f"📦 Loaded {MODEL_PATH}")
+
     print(f"\n🚀 House Price Predictor App Starting...")
-    print(f"📊 Model Performance:")
-    print(f"   - Mean Absolute Error: ₹{mae:,.2f}")
-    print(f"   - R² Score: {r2:.3f}")
-    print(f"🌐 Access the app at: http://localhost:5000")
-    
+    print(f"🌐 Access the app at: http://{args.host}:{args.port}")
+
     # Run Flask app
-    app.run(debug=True, port=5000)
+    create_app().run(debug=args.debug, host=args.host, port=args.port)
+
+if __name__ == '__main__':
+    serve_main(['--retrain', '--debug'])
 
 # To run this project:
 # 1. Save as house_price_ml.py
 # 2. Install requirements: pip install flask scikit-learn pandas numpy joblib
 # 3. Run: python house_price_ml.py
 # 4. Open browser to http://localhost:5000
+# 5. Or use the project CLI: python cli.py train, then python cli.py serve
+# 6. Trace requests: TRACE=trace.json python cli.py serve (see tracing.py)
+# 7. Compare models and serve the best one within a latency budget:
+#    python cli.py train --models all --p99-budget-ms 2
+# 8. Similar listings: python cli.py train --comparables, then POST /predict with
+#    "comparables": 5, or score-file --comparables 5
 
 # Features:
 # - Machine Learning with Scikit-learn
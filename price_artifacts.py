@@ -0,0 +1,11 @@
+# Saved Artifacts of the House Price Model
+# Author: Ajay Mondal
+# Technologies: Python
+
+# Feature columns in the order the model and scaler are trained on
+FEATURE_NAMES = ['area', 'bedrooms', 'bathrooms', 'age', 'location_score']
+
+# Written by train_model() in ml-price-predictor.py, read by the web app and price_scoring.py
+MODEL_PATH = 'house_price_model.pkl'
+SCALER_PATH = 'scaler.pkl'
+COMPARABLES_PATH = 'comparables.pkl'
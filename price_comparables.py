@@ -0,0 +1,83 @@
+# Nearest Comparable Listings for the House Price Predictor
+# Author: Ajay Mondal
+# Technologies: Python, Scikit-learn (KDTree), NumPy, joblib
+
+import numpy as np
+
+from price_artifacts import COMPARABLES_PATH
+
+# Comparables returned when a request asks for them without a count
+DEFAULT_K = 5
+MAX_K = 50
+
+# Points per KD-tree leaf; small leaves suit a handful of features
+LEAF_SIZE = 30
+
+
+def build_index(X_train, prices, ids=None):
+    """KD-tree over the standardised training features plus their prices
+
+    Lookups walk the tree, so a query costs O(log n) instead of a scan of
+    the training data. The tree keeps its own float64 copy of X_train
+    (8 bytes per feature per row). ids are the source row ids of the
+    training rows; without them rows are numbered by position.
+    """
+    from sklearn.neighbors import KDTree
+
+    return {
+        'tree': KDTree(X_train, leaf_size=LEAF_SIZE),
+        # Copies, so the index doesn't keep the whole training array alive
+        'prices': np.array(prices),
+        'ids': np.arange(len(X_train)) if ids is None else np.array(ids),
+    }
+
+
+def save_index(index, path=COMPARABLES_PATH):
+    import joblib
+    joblib.dump(index, path)
+
+
+def load_index(path=COMPARABLES_PATH):
+    import joblib
+    return joblib.load(path)
+
+
+def query(index, scaled_rows, k=DEFAULT_K):
+    """(distances, training positions) of the k nearest listings for each row"""
+    k = max(1, min(k, MAX_K, len(index['prices'])))
+    return index['tree'].query(np.asarray(scaled_rows, dtype=np.float64), k=k)
+
+
+def find_comparables(index, scaler, scaled_rows, feature_names, k=DEFAULT_K):
+    """The k most similar training listings for each row, nearest first"""
+    distances, positions = query(index, scaled_rows, k)
+    points = index['tree'].get_arrays()[0]
+    comparables = []
+    for row_distances, row_positions in zip(distances, positions):
+        # Back to sq ft, bedrooms, ... for display
+        features = scaler.inverse_transform(points[row_positions])
+        comparables.append([
+            {
+                'id': index['ids'][position].item(),
+                'price': round(float(index['prices'][position]), 2),
+                'distance': round(float(distance), 4),
+                'features': dict(zip(feature_names, np.round(row_features, 2).tolist())),
+            }
+            for position, distance, row_features in zip(row_positions, row_distances, features)
+        ])
+    return comparables
+
+
+def comparable_names(k):
+    """Batch output columns: comparable_1_id, comparable_1_price, comparable_2_id, ..."""
+    return [f'comparable_{rank}_{field}' for rank in range(1, k + 1) for field in ('id', 'price')]
+
+
+def comparable_columns(index, scaled_rows, k=DEFAULT_K):
+    """Exactly k comparables per row as flat columns named by comparable_names(k)"""
+    _, positions = index['tree'].query(np.asarray(scaled_rows, dtype=np.float64), k=k)
+    columns = {}
+    for rank in range(k):
+        columns[f'comparable_{rank + 1}_id'] = index['ids'][positions[:, rank]]
+        columns[f'comparable_{rank + 1}_price'] = index['prices'][positions[:, rank]].round(2)
+    return columns
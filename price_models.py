@@ -0,0 +1,164 @@
+# Model Zoo for the House Price Predictor
+# Author: Ajay Mondal
+# Technologies: Python, Scikit-learn, NumPy
+
+import gc
+import pickle
+import time
+
+# Serving model must predict one listing within this many milliseconds at p99
+P99_BUDGET_MS = 5.0
+
+# Single-row predictions timed per model, and rows per batch prediction
+LATENCY_SAMPLES = 1000
+BATCH_ROWS = 10000
+
+# Written next to the model so the choice can be audited later
+REPORT_PATH = 'model_report.json'
+
+
+def linear():
+    from sklearn.linear_model import LinearRegression
+    return LinearRegression()
+
+
+def ridge():
+    from sklearn.linear_model import Ridge
+    return Ridge(alpha=1.0)
+
+
+def polynomial_ridge():
+    # Squares and pairwise products of FEATURE_NAMES, e.g. area x location_score
+    from sklearn.linear_model import Ridge
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import PolynomialFeatures
+    return make_pipeline(PolynomialFeatures(degree=2, include_bias=False), Ridge(alpha=1.0))
+
+
+def gradient_boosting():
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    return HistGradientBoostingRegressor(max_iter=200, random_state=42)
+
+
+def nearest_neighbors():
+    from sklearn.neighbors import KNeighborsRegressor
+    return KNeighborsRegressor(n_neighbors=10, weights='distance')
+
+
+MODELS = {
+    'linear': linear,
+    'ridge': ridge,
+    'poly_ridge': polynomial_ridge,
+    'gbt': gradient_boosting,
+    'knn': nearest_neighbors,
+}
+
+
+def create_model(name):
+    if name not in MODELS:
+        raise ValueError(f"Unknown model: {name} (choose from {', '.join(MODELS)})")
+    return MODELS[name]()
+
+
+def percentile_ms(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+
+
+def measure_latency(model, X_test, samples=LATENCY_SAMPLES, batch_rows=BATCH_ROWS):
+    """Single-row p50/p99 in ms and batch throughput in rows/s"""
+    model.predict(X_test[:1])  # warm-up
+    timings = []
+    batch = X_test[:batch_rows]
+    batch_seconds = float('inf')
+    # Collector pauses would land on whichever model happens to be running
+    gc.disable()
+    try:
+        for i in range(samples):
+            row = X_test[i % len(X_test):i % len(X_test) + 1]
+            started = time.perf_counter()
+            model.predict(row)
+            timings.append(time.perf_counter() - started)
+        for _ in range(3):
+            started = time.perf_counter()
+            model.predict(batch)
+            batch_seconds = min(batch_seconds, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return {
+        'single_p50_ms': round(percentile_ms(timings, 50), 3),
+        'single_p99_ms': round(percentile_ms(timings, 99), 3),
+        'batch_rows_per_second': round(len(batch) / batch_seconds) if batch_seconds else None,
+    }
+
+
+def benchmark(names, X_train, y_train, X_test, y_test, on_result=None):
+    """Train and time every named model on the same split
+
+    Returns (results, fitted models by name); each result holds MAE, R²,
+    fit time, single-row and batch latency, and pickled size.
+    """
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    results = []
+    fitted = {}
+    for name in names:
+        model = create_model(name)
+        started = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - started
+
+        y_pred = model.predict(X_test)
+        result = {
+            'model': name,
+            'estimator': type(model[-1] if hasattr(model, 'steps') else model).__name__,
+            'mae': round(float(mean_absolute_error(y_test, y_pred)), 2),
+            'r2': round(float(r2_score(y_test, y_pred)), 4),
+            'fit_seconds': round(fit_seconds, 3),
+            **measure_latency(model, X_test),
+            'size_bytes': len(pickle.dumps(model)),
+        }
+        results.append(result)
+        fitted[name] = model
+        if on_result:
+            on_result(result)
+    return results, fitted
+
+
+def select_model(results, p99_budget_ms=P99_BUDGET_MS):
+    """Most accurate (lowest MAE) result within the latency budget
+
+    If nothing meets the budget the fastest model is chosen instead.
+    """
+    within_budget = [result for result in results if result['single_p99_ms'] <= p99_budget_ms]
+    if within_budget:
+        return min(within_budget, key=lambda result: result['mae'])
+    return min(results, key=lambda result: result['single_p99_ms'])
+
+
+def feature_weights(model, names, X_test, y_test):
+    """Per-feature weights for the metrics chart
+
+    Linear models report their coefficients (Rs per std. dev.); other models
+    report how much MAE grows when that feature is shuffled (Rs).
+    """
+    if hasattr(model, 'coef_') and len(model.coef_) == len(names):
+        return dict(zip(names, map(float, model.coef_)))
+
+    import numpy as np
+    from sklearn.inspection import permutation_importance
+
+    sample = slice(0, min(len(X_test), 2000))
+    importance = permutation_importance(model, X_test[sample], y_test[sample], n_repeats=3,
+                                        random_state=42, scoring='neg_mean_absolute_error')
+    return dict(zip(names, map(float, np.round(importance.importances_mean, 2))))
+
+
+def format_table(results, chosen=None):
+    lines = [f"{'model':<12}{'MAE (Rs)':>12}{'R²':>8}{'p50 ms':>9}{'p99 ms':>9}{'batch rows/s':>14}{'size KB':>10}"]
+    for result in results:
+        marker = ' ✅' if chosen and result['model'] == chosen['model'] else ''
+        lines.append(f"{result['model']:<12}{result['mae']:>12,.0f}{result['r2']:>8.3f}"
+                     f"{result['single_p50_ms']:>9.3f}{result['single_p99_ms']:>9.3f}"
+                     f"{result['batch_rows_per_second'] or 0:>14,}{result['size_bytes'] / 1024:>10.1f}{marker}")
+    return '\n'.join(lines)
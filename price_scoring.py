@@ -0,0 +1,314 @@
+# Offline Scoring for the House Price Model
+# Author: Ajay Mondal
+# Technologies: Python, Pandas, PyArrow, Scikit-learn, joblib, multiprocessing
+
+import argparse
+import csv
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import tracing
+from price_artifacts import COMPARABLES_PATH, FEATURE_NAMES, MODEL_PATH, SCALER_PATH
+
+ID_COLUMN = 'id'
+PREDICTION_COLUMN = 'predicted_price'
+
+# CSV input is split into byte ranges of about this size, parsed by the workers
+CHUNK_BYTES = 16 * 1024 * 1024
+
+# Chunks queued per worker; together with the chunk size this bounds memory
+IN_FLIGHT_PER_WORKER = 2
+
+# Model and scaler loaded once by each worker process
+worker_model = None
+worker_scaler = None
+worker_comparables = None
+worker_comparable_count = 0
+
+
+def load_artifacts(model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    """The model and scaler saved by train_model()"""
+    import joblib
+
+    return joblib.load(model_path), joblib.load(scaler_path)
+
+
+def init_worker(model_path, scaler_path, comparables_path=None, comparable_count=0):
+    """Load this worker's copy of the model, and the comparables index if asked for"""
+    global worker_model, worker_scaler, worker_comparables, worker_comparable_count
+    worker_model, worker_scaler = load_artifacts(model_path, scaler_path)
+    if comparable_count:
+        import price_comparables
+        worker_comparables = price_comparables.load_index(comparables_path)
+        worker_comparable_count = comparable_count
+
+
+def feature_columns(scaler):
+    # A scaler fitted on a DataFrame remembers its column order
+    return list(getattr(scaler, 'feature_names_in_', FEATURE_NAMES))
+
+
+def score_frame(frame, model, scaler, id_column=ID_COLUMN, comparables=None, comparable_count=0):
+    """Predict a price for every row of a DataFrame in one call
+
+    With a comparables index, the ids and prices of the comparable_count
+    nearest training listings are added as extra columns.
+    """
+    import pandas as pd
+
+    scaled = scaler.transform(frame[feature_columns(scaler)])
+    predictions = model.predict(scaled)
+    scored = pd.DataFrame({PREDICTION_COLUMN: predictions.round(2)}, index=frame.index)
+    if id_column in frame.columns:
+        scored.insert(0, id_column, frame[id_column].values)
+    if comparable_count:
+        import price_comparables
+        for name, values in price_comparables.comparable_columns(comparables, scaled, comparable_count).items():
+            scored[name] = values
+    return scored
+
+
+def plan_csv_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """The header line and (start, end) byte ranges that each hold whole lines"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        ranges = []
+        start = f.tell()
+        while start < size:
+            f.seek(min(size, start + chunk_bytes))
+            # Finish the line the cut landed in
+            f.readline()
+            end = min(size, f.tell())
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def read_csv_bytes(data, columns):
+    """Parse CSV text with PyArrow's reader, or pandas' if PyArrow isn't installed"""
+    try:
+        import pyarrow.csv
+    except ImportError:
+        import pandas as pd
+        return pd.read_csv(io.BytesIO(data), usecols=columns)
+    options = pyarrow.csv.ConvertOptions(include_columns=columns)
+    return pyarrow.csv.read_csv(io.BytesIO(data), convert_options=options).to_pandas()
+
+
+def csv_bytes(frame):
+    """Scored rows as CSV lines without a header"""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv
+    except ImportError:
+        return frame.to_csv(index=False, header=False).encode('utf-8')
+    buffer = io.BytesIO()
+    pyarrow.csv.write_csv(pa.Table.from_pandas(frame, preserve_index=False), buffer,
+                          pyarrow.csv.WriteOptions(include_header=False))
+    return buffer.getvalue()
+
+
+def score_csv_chunk(path, header, start, end, columns, id_column):
+    """Worker: parse and score one byte range of a CSV file"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    frame = read_csv_bytes(header + data, columns)
+    return score_frame(frame, worker_model, worker_scaler, id_column,
+                       worker_comparables, worker_comparable_count)
+
+
+def score_parquet_chunk(path, row_group, columns, id_column):
+    """Worker: read and score one row group of a Parquet file"""
+    import pyarrow.parquet as pq
+
+    frame = pq.ParquetFile(path).read_row_group(row_group, columns=columns).to_pandas()
+    return score_frame(frame, worker_model, worker_scaler, id_column,
+                       worker_comparables, worker_comparable_count)
+
+
+def score_chunk(function, args, as_csv):
+    """Worker entry point: (rows, output) for one chunk
+
+    CSV output is formatted here too, so the parent only appends bytes.
+    """
+    scored = function(*args)
+    return len(scored), csv_bytes(scored) if as_csv else scored
+
+
+def plan_chunks(path, scaler, id_column, chunk_bytes=CHUNK_BYTES):
+    """Columns read and (function, args) for every chunk of the input, in file order"""
+    features = feature_columns(scaler)
+    if path.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        available = parquet.schema_arrow.names
+        chunks = [(score_parquet_chunk, (row_group,)) for row_group in range(parquet.num_row_groups)]
+    else:
+        header, ranges = plan_csv_chunks(path, chunk_bytes)
+        available = next(csv.reader([header.decode('utf-8-sig')]), [])
+        chunks = [(score_csv_chunk, (header, start, end)) for start, end in ranges]
+
+    missing = [column for column in features if column not in available]
+    if missing:
+        raise ValueError(f"{path} is missing feature columns: {', '.join(missing)}")
+    columns = features + ([id_column] if id_column in available and id_column not in features else [])
+    return columns, [(function, (path,) + args + (columns, id_column)) for function, args in chunks]
+
+
+class CsvOutput:
+    """Append CSV chunks formatted by the workers"""
+
+    as_csv = True
+
+    def __init__(self, path, columns):
+        self.file = open(path, 'wb')
+        self.file.write((','.join(columns) + '\n').encode('utf-8'))
+
+    def write(self, data):
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetOutput:
+    """Write each scored chunk as its own Parquet row group"""
+
+    as_csv = False
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def score_file(input_path, output_path, model_path=MODEL_PATH, scaler_path=SCALER_PATH,
+               id_column=ID_COLUMN, workers=None, chunk_bytes=CHUNK_BYTES, progress=None,
+               comparable_count=0, comparables_path=COMPARABLES_PATH):
+    """Stream a CSV or Parquet file of listings through the model
+
+    Chunks are scored in worker processes and written in input order as they
+    finish, with only a few chunks in memory at a time. A comparable_count
+    adds that many nearest training listings to each row. Returns a dict with
+    the row count, timing and peak memory.
+    """
+    started = time.perf_counter()
+    import joblib
+
+    # The parent only needs the scaler's column names; workers load the model
+    scaler = joblib.load(scaler_path)
+    columns, chunks = plan_chunks(input_path, scaler, id_column, chunk_bytes)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(chunks)))
+
+    output_class = ParquetOutput if output_path.lower().endswith('.parquet') else CsvOutput
+    output_columns = [id_column, PREDICTION_COLUMN] if id_column in columns else [PREDICTION_COLUMN]
+    if comparable_count:
+        import price_comparables
+        output_columns += price_comparables.comparable_names(comparable_count)
+    output = output_class(output_path, output_columns)
+    worker_args = (model_path, scaler_path, comparables_path, comparable_count)
+    rows = 0
+
+    def write(result):
+        nonlocal rows
+        chunk_rows, data = result
+        output.write(data)
+        rows += chunk_rows
+        if progress:
+            progress(rows)
+
+    try:
+        if workers == 1:
+            # Score in this process when there is one worker or one chunk
+            init_worker(*worker_args)
+            for function, args in chunks:
+                write(score_chunk(function, args, output.as_csv))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=worker_args) as pool:
+                pending = deque()
+                for function, args in chunks:
+                    if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                        write(pending.popleft().result())
+                    pending.append(pool.submit(score_chunk, function, args, output.as_csv))
+                while pending:
+                    write(pending.popleft().result())
+    finally:
+        output.close()
+
+    seconds = time.perf_counter() - started
+    return {
+        'rows': rows,
+        'chunks': len(chunks),
+        'workers': workers,
+        'seconds': round(seconds, 2),
+        'rows_per_second': round(rows / seconds) if seconds else rows,
+        'peak_rss_mb': tracing.peak_rss_mb(),
+        'worker_peak_rss_mb': tracing.peak_rss_mb(children=True) if workers > 1 else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file of listings with the price model")
+    parser.add_argument('input', help="listings (.csv or .parquet) with the model's feature columns")
+    parser.add_argument('output', help="where to write predictions (.csv or .parquet)")
+    parser.add_argument('--model', default=MODEL_PATH, help="saved model")
+    parser.add_argument('--scaler', default=SCALER_PATH, help="saved scaler")
+    parser.add_argument('--id-column', default=ID_COLUMN, help="column copied to the output with each prediction")
+    parser.add_argument('--workers', type=int, help="scoring processes (default: CPU count)")
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_BYTES / (1024 * 1024),
+                        help="CSV bytes parsed per chunk")
+    parser.add_argument('--comparables', type=int, default=0, metavar='K',
+                        help="add the ids and prices of the K most similar training listings")
+    parser.add_argument('--comparables-index', default=COMPARABLES_PATH, help="saved comparables index")
+    args = parser.parse_args(argv)
+
+    for path in (args.model, args.scaler):
+        if not os.path.exists(path):
+            parser.error(f"{path} not found; train the model first (python cli.py train)")
+    if args.comparables and not os.path.exists(args.comparables_index):
+        parser.error(f"{args.comparables_index} not found; train with python cli.py train --comparables")
+    import price_comparables
+    if not 0 <= args.comparables <= price_comparables.MAX_K:
+        parser.error(f"--comparables must be between 0 and {price_comparables.MAX_K}")
+
+    try:
+        result = score_file(args.input, args.output, args.model, args.scaler, args.id_column,
+                            args.workers, int(args.chunk_mb * 1024 * 1024),
+                            comparable_count=args.comparables, comparables_path=args.comparables_index)
+    except ValueError as e:
+        parser.error(str(e))
+    # Peak memory is None where the platform can't measure it
+    memory = f", peak memory {result['peak_rss_mb']} MB" if result['peak_rss_mb'] is not None else ''
+    if result['worker_peak_rss_mb']:
+        memory += f" (largest worker {result['worker_peak_rss_mb']} MB)"
+    print(f"✅ {result['rows']:,} listings scored into {args.output} in {result['seconds']}s "
+          f"({result['rows_per_second']:,} rows/s, {result['workers']} worker{'s' if result['workers'] > 1 else ''}{memory})")
+
+
+if __name__ == '__main__':
+    main()
+
+# To score a file of listings:
+# 1. Train the model: python cli.py train
+# 2. Run: python cli.py score-file listings.csv predictions.csv
+# 3. Multi-GB files stream through in chunks; tune with --workers and --chunk-mb
+# 4. Add the 5 most similar training listings to each row: train with --comparables, then --comparables 5
@@ -7,14 +7,24 @@ Author: Ajay Mondal
 Technologies: Python, SQLite, Tkinter
 """
 
+import time
+
+# Startup phases are timed from the first line of the module
+STARTUP_STARTED = time.perf_counter()
+
 import sqlite3
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import os
+import student_db
+from student_repository import StudentRepository
+import student_export
+import tracing
+
+# Rows inserted into the list per event-loop turn after the first page
+INSERT_BATCH = 1000
 
 class StudentManagementSystem:
     def __init__(self, root):
@@ -22,50 +32,42 @@ class StudentManagementSystem:
         self.root.title("Smart Student Management System - By Ajay Mondal")
         self.root.geometry("1200x700")
         self.root.configure(bg='#f0f0f0')
+        self.startup = []
+        self.mark_startup('imports')
+        self.root.bind('<Map>', self.on_first_map, add='+')
         
         # Initialize database
         self.init_database()
+        self.mark_startup('database')
         
         # Create main interface
         self.create_interface()
+        self.mark_startup('interface')
         
-        # Load data
+        # Load data in the background so the window shows up right away
+        self.load_generation = 0
         self.load_students()
     
+    def mark_startup(self, phase):
+        """Record the time from launch to this startup phase"""
+        if self.startup is not None:
+            self.startup.append((phase, (time.perf_counter() - STARTUP_STARTED) * 1000))
+    
+    def on_first_map(self, event):
+        if event.widget is self.root and self.startup and 'window shown' not in dict(self.startup):
+            self.mark_startup('window shown')
+    
+    def report_startup(self):
+        """Print the startup timeline once the first rows are visible"""
+        phases = ', '.join(f"{phase} {ms:.0f} ms" for phase, ms in self.startup)
+        print(f"⏱ Startup: {phases}")
+        self.status_label.config(text=f"Ready in {self.startup[-1][1]:.0f} ms")
+        self.startup = None
+    
     def init_database(self):
-        """Initialize SQLite database with student table"""
-        self.conn = sqlite3.connect('student_records.db')
-        self.cursor = self.conn.cursor()
-        
-        # Create students table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                roll_number TEXT UNIQUE NOT NULL,
-                email TEXT,
-                phone TEXT,
-                course TEXT,
-                year INTEGER,
-                attendance REAL DEFAULT 0,
-                grade REAL DEFAULT 0,
-                created_date TEXT,
-                updated_date TEXT
-            )
-        ''')
-        
-        # Create attendance table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS attendance (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER,
-                date TEXT,
-                status TEXT,
-                FOREIGN KEY (student_id) REFERENCES students (id)
-            )
-        ''')
-        
-        self.conn.commit()
+        """Open the student repository (creates the database on first run)"""
+        self.repository = StudentRepository()
+        self.conn = self.repository.connection()
     
     def create_interface(self):
         """Create the main GUI interface"""
@@ -184,10 +186,21 @@ class StudentManagementSystem:
         action_frame = tk.Frame(list_frame, bg='#f0f0f0')
         action_frame.pack(fill='x', pady=5)
         
-        tk.Button(action_frame, text="Export to Excel", command=self.export_to_excel,
-                 bg='#8e44ad', fg='white', font=('Arial', 10)).pack(side='left', padx=5)
+        self.export_button = tk.Button(action_frame, text="Export Data", command=self.export_to_excel,
+                                       bg='#8e44ad', fg='white', font=('Arial', 10))
+        self.export_button.pack(side='left', padx=5)
         tk.Button(action_frame, text="Generate Report", command=self.generate_report,
                  bg='#e67e22', fg='white', font=('Arial', 10)).pack(side='left', padx=5)
+        tk.Button(action_frame, text="Mark Attendance", command=self.open_attendance_dialog,
+                 bg='#16a085', fg='white', font=('Arial', 10)).pack(side='left', padx=5)
+        
+        self.status_label = tk.Label(action_frame, text="Loading...", font=('Arial', 9),
+                                     bg='#f0f0f0', fg='#7f8c8d')
+        self.status_label.pack(side='right', padx=5)
+        
+        # Export progress
+        self.export_progress = ttk.Progressbar(action_frame, length=150, maximum=100)
+        self.export_status = tk.Label(action_frame, text="", font=('Arial', 9), bg='#f0f0f0')
     
     def create_analytics(self, parent):
         """Create analytics section with charts"""
@@ -195,16 +208,23 @@ class StudentManagementSystem:
                                        font=('Arial', 12, 'bold'), bg='#f0f0f0')
         analytics_frame.pack(fill='both', expand=True)
         
-        # Create matplotlib figure
-        self.fig, ((self.ax1, self.ax2), (self.ax3, self.ax4)) = plt.subplots(2, 2, figsize=(10, 6))
-        self.fig.patch.set_facecolor('#f0f0f0')
-        
-        # Canvas for matplotlib
-        self.canvas = FigureCanvasTkAgg(self.fig, analytics_frame)
-        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+        # Matplotlib is only imported once the charts are asked for
+        self.analytics_frame = analytics_frame
+        self.dashboard = None
+        self.dashboard_button = tk.Button(analytics_frame, text="Show Charts", command=self.show_dashboard,
+                                          bg='#2c3e50', fg='white', font=('Arial', 11))
+        self.dashboard_button.pack(pady=40)
+    
+    def show_dashboard(self):
+        """Build the chart grid on first use"""
+        started = time.perf_counter()
+        import student_dashboard
         
-        # Update analytics
+        self.dashboard_button.destroy()
+        # Charts update in place and redraws are coalesced
+        self.dashboard = student_dashboard.AnalyticsDashboard(self.analytics_frame, self.repository, self.root)
         self.update_analytics()
+        print(f"⏱ Dashboard ready in {(time.perf_counter() - started) * 1000:.0f} ms")
     
     def add_student(self):
         """Add new student to database"""
@@ -218,16 +238,8 @@ class StudentManagementSystem:
                 return
             
             # Insert into database
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cursor.execute('''
-                INSERT INTO students (name, roll_number, email, phone, course, year, 
-                                    attendance, grade, created_date, updated_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (data['name'], data['roll_number'], data['email'], data['phone'],
-                  data['course'], data['year'], data['attendance'], data['grade'],
-                  current_time, current_time))
+            self.repository.add_student(data)
             
-            self.conn.commit()
             messagebox.showinfo("Success", "Student added successfully!")
             self.load_students()
             self.clear_fields()
@@ -253,15 +265,8 @@ class StudentManagementSystem:
             data = {key: entry.get() for key, entry in self.entries.items()}
             
             # Update database
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cursor.execute('''
-                UPDATE students SET name=?, email=?, phone=?, course=?, year=?, 
-                                  attendance=?, grade=?, updated_date=?
-                WHERE id=?
-            ''', (data['name'], data['email'], data['phone'], data['course'],
-                  data['year'], data['attendance'], data['grade'], current_time, student_id))
+            self.repository.update_student(student_id, data)
             
-            self.conn.commit()
             messagebox.showinfo("Success", "Student updated successfully!")
             self.load_students()
             self.update_analytics()
@@ -279,8 +284,7 @@ class StudentManagementSystem:
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this student?"):
             try:
                 student_id = self.tree.item(selected[0])['values'][0]
-                self.cursor.execute('DELETE FROM students WHERE id=?', (student_id,))
-                self.conn.commit()
+                self.repository.delete_student(student_id)
                 messagebox.showinfo("Success", "Student deleted successfully!")
                 self.load_students()
                 self.clear_fields()
@@ -297,70 +301,190 @@ class StudentManagementSystem:
                 entry.delete(0, tk.END)
     
     def load_students(self):
-        """Load students into treeview"""
+        """Load students into treeview, first page first, without blocking the window"""
+        self.load_generation += 1
+        generation = self.load_generation
+        
         # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
+        
+        # Fetch from database on a worker thread (it gets its own pooled connection)
+        self.run_in_background(self.load_first_page, lambda rows: self.show_first_page(generation, rows))
+    
+    def load_first_page(self):
+        # Runs on the worker, so the span covers the query rather than the scheduling
+        with tracing.span('load_students.first_page'):
+            return self.repository.search(limit=student_db.PAGE_SIZE)
+    
+    def load_rest(self):
+        with tracing.span('load_students.rest'):
+            return self.repository.search(limit=-1, offset=student_db.PAGE_SIZE)
+    
+    def show_first_page(self, generation, rows):
+        if generation != self.load_generation:
+            return
+        self.insert_rows(rows)
+        if self.startup is not None:
+            self.mark_startup('first page')
+            self.report_startup()
         
-        # Fetch from database
-        self.cursor.execute('SELECT id, name, roll_number, course, year, attendance, grade FROM students')
-        for row in self.cursor.fetchall():
+        # Everything after the first page streams in behind it
+        if len(rows) == student_db.PAGE_SIZE:
+            self.run_in_background(self.load_rest,
+                                   lambda rest: self.insert_in_batches(generation, rest, 0))
+    
+    def insert_in_batches(self, generation, rows, start):
+        """Add rows a batch per event-loop turn so the window stays responsive"""
+        if generation != self.load_generation:
+            return
+        self.insert_rows(rows[start:start + INSERT_BATCH])
+        if start + INSERT_BATCH < len(rows):
+            self.root.after(1, self.insert_in_batches, generation, rows, start + INSERT_BATCH)
+    
+    @tracing.traced()
+    def insert_rows(self, rows):
+        for row in rows:
             self.tree.insert('', tk.END, values=row)
     
+    def run_in_background(self, func, on_done):
+        """Run func on a worker thread and hand its result to on_done on the Tk thread"""
+        result = {}
+        
+        def work():
+            try:
+                result['value'] = func()
+            except Exception as e:
+                result['error'] = e
+        
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        
+        def poll():
+            if thread.is_alive():
+                self.root.after(20, poll)
+            elif 'error' in result:
+                messagebox.showerror("Error", f"Loading students failed: {str(result['error'])}")
+            else:
+                on_done(result['value'])
+        
+        self.root.after(20, poll)
+    
+    @tracing.traced()
     def on_select(self, event):
         """Handle treeview selection"""
         selected = self.tree.selection()
         if selected:
             # Get student data
             student_id = self.tree.item(selected[0])['values'][0]
-            self.cursor.execute('SELECT * FROM students WHERE id=?', (student_id,))
-            student = self.cursor.fetchone()
+            student = self.repository.get_student(student_id)
             
             if student:
                 # Populate form fields
                 fields = ['name', 'roll_number', 'email', 'phone', 'course', 'year', 'attendance', 'grade']
-                for i, field in enumerate(fields):
+                for field in fields:
                     entry = self.entries[field]
                     if isinstance(entry, ttk.Combobox):
-                        entry.set(str(student[i + 1]))
+                        entry.set(str(student[field]))
                     else:
                         entry.delete(0, tk.END)
-                        entry.insert(0, str(student[i + 1]) if student[i + 1] else '')
+                        entry.insert(0, str(student[field]) if student[field] else '')
     
+    @tracing.traced()
     def export_to_excel(self):
-        """Export student data to Excel"""
+        """Export student data to Excel, CSV or Parquet in the background"""
         try:
-            # Get data from database
-            df = pd.read_sql_query('SELECT * FROM students', self.conn)
-            
             # Ask for file location
             filename = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+                filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"),
+                           ("Parquet files", "*.parquet"), ("All files", "*.*")]
             )
             
             if filename:
-                df.to_excel(filename, index=False)
-                messagebox.showinfo("Success", f"Data exported to {filename}")
+                # Stream rows in chunks on a worker thread with its own connection
+                self.export_job = student_export.ExportJob(filename)
+                self.export_job.start()
+                self.export_button.config(state='disabled')
+                self.export_progress.pack(side='left', padx=5)
+                self.export_status.pack(side='left', padx=5)
+                self.poll_export()
                 
         except Exception as e:
             messagebox.showerror("Error", f"Export failed: {str(e)}")
     
+    def poll_export(self):
+        """Show export progress until the background job finishes"""
+        job = self.export_job
+        self.export_progress['value'] = job.percent
+        self.export_status.config(text=f"{job.rows_written:,} / {job.total:,} rows")
+        
+        if not job.done:
+            self.root.after(100, self.poll_export)
+            return
+        
+        self.export_button.config(state='normal')
+        self.export_progress.pack_forget()
+        self.export_status.pack_forget()
+        if job.error:
+            messagebox.showerror("Error", f"Export failed: {str(job.error)}")
+        else:
+            messagebox.showinfo("Success", f"Data exported to {job.filename}")
+    
+    def open_attendance_dialog(self):
+        """Take roll call for one course/year section"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Mark Attendance")
+        dialog.configure(bg='#f0f0f0')
+        
+        tk.Label(dialog, text="Date (YYYY-MM-DD):", bg='#f0f0f0').grid(row=0, column=0, sticky='w', padx=5, pady=5)
+        date_entry = tk.Entry(dialog)
+        date_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        date_entry.grid(row=0, column=1, padx=5, pady=5, sticky='ew')
+        
+        tk.Label(dialog, text="Course:", bg='#f0f0f0').grid(row=1, column=0, sticky='w', padx=5, pady=5)
+        course_box = ttk.Combobox(dialog, values=['BCA', 'MCA', 'B.Tech', 'M.Tech', 'BSc CS'])
+        course_box.set('BCA')
+        course_box.grid(row=1, column=1, padx=5, pady=5, sticky='ew')
+        
+        tk.Label(dialog, text="Year:", bg='#f0f0f0').grid(row=2, column=0, sticky='w', padx=5, pady=5)
+        year_box = ttk.Combobox(dialog, values=[1, 2, 3, 4])
+        year_box.set('2')
+        year_box.grid(row=2, column=1, padx=5, pady=5, sticky='ew')
+        
+        tk.Label(dialog, text="Absent roll numbers:", bg='#f0f0f0').grid(row=3, column=0, sticky='nw', padx=5, pady=5)
+        absent_text = tk.Text(dialog, width=30, height=5)
+        absent_text.grid(row=3, column=1, padx=5, pady=5)
+        
+        def save():
+            try:
+                absent = absent_text.get('1.0', tk.END).replace(',', ' ').split()
+                marked, unknown = self.repository.mark_class(date_entry.get().strip(), course_box.get(),
+                                                             year_box.get(), absent=absent)
+                if unknown:
+                    # Keep the dialog open so the roll numbers can be corrected
+                    messagebox.showerror("Error", "Not in this course/year, nothing saved: "
+                                         + ", ".join(unknown), parent=dialog)
+                    return
+                dialog.destroy()
+                messagebox.showinfo("Success", f"Attendance saved for {marked} students!")
+                self.load_students()
+                self.update_analytics()
+            except Exception as e:
+                messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        
+        tk.Button(dialog, text="Save", command=save, bg='#27ae60', fg='white',
+                 font=('Arial', 10, 'bold'), width=12).grid(row=4, column=0, columnspan=2, pady=10)
+    
+    @tracing.traced()
     def generate_report(self):
         """Generate comprehensive report"""
         try:
-            # Get statistics
-            self.cursor.execute('SELECT COUNT(*) FROM students')
-            total_students = self.cursor.fetchone()[0]
-            
-            self.cursor.execute('SELECT AVG(attendance) FROM students WHERE attendance > 0')
-            avg_attendance = self.cursor.fetchone()[0] or 0
-            
-            self.cursor.execute('SELECT AVG(grade) FROM students WHERE grade > 0')
-            avg_grade = self.cursor.fetchone()[0] or 0
-            
-            self.cursor.execute('SELECT course, COUNT(*) FROM students GROUP BY course')
-            course_stats = self.cursor.fetchall()
+            # Get statistics from the trigger-maintained summary tables
+            summary = self.repository.report()
+            total_students = summary['total_students']
+            avg_attendance = summary['avg_attendance']
+            avg_grade = summary['avg_grade']
+            course_stats = summary['courses']
             
             # Create report
             report = f"""
@@ -378,6 +502,12 @@ class StudentManagementSystem:
             for course, count in course_stats:
                 report += f"{course}: {count} students\\n            "
             
+            # Cohort analytics (needs NumPy)
+            try:
+                report += "\\n=== COHORT ANALYTICS ===\\n" + self.repository.cohort_report()
+            except ImportError:
+                pass
+            
             # Save report
             filename = filedialog.asksaveasfilename(
                 defaultextension=".txt",
@@ -393,59 +523,14 @@ class StudentManagementSystem:
             messagebox.showerror("Error", f"Report generation failed: {str(e)}")
     
     def update_analytics(self):
-        """Update analytics charts"""
-        try:
-            # Clear previous plots
-            for ax in [self.ax1, self.ax2, self.ax3, self.ax4]:
-                ax.clear()
-            
-            # Chart 1: Course Distribution
-            self.cursor.execute('SELECT course, COUNT(*) FROM students GROUP BY course')
-            course_data = self.cursor.fetchall()
-            if course_data:
-                courses, counts = zip(*course_data)
-                self.ax1.pie(counts, labels=courses, autopct='%1.1f%%')
-                self.ax1.set_title('Course Distribution')
-            
-            # Chart 2: Attendance Distribution
-            self.cursor.execute('SELECT attendance FROM students WHERE attendance > 0')
-            attendance_data = [row[0] for row in self.cursor.fetchall()]
-            if attendance_data:
-                self.ax2.hist(attendance_data, bins=10, color='skyblue', edgecolor='black')
-                self.ax2.set_title('Attendance Distribution')
-                self.ax2.set_xlabel('Attendance %')
-                self.ax2.set_ylabel('Number of Students')
-            
-            # Chart 3: Grade Distribution
-            self.cursor.execute('SELECT grade FROM students WHERE grade > 0')
-            grade_data = [row[0] for row in self.cursor.fetchall()]
-            if grade_data:
-                self.ax3.hist(grade_data, bins=10, color='lightgreen', edgecolor='black')
-                self.ax3.set_title('Grade Distribution')
-                self.ax3.set_xlabel('Grade (0-10)')
-                self.ax3.set_ylabel('Number of Students')
-            
-            # Chart 4: Year-wise Distribution
-            self.cursor.execute('SELECT year, COUNT(*) FROM students GROUP BY year')
-            year_data = self.cursor.fetchall()
-            if year_data:
-                years, year_counts = zip(*year_data)
-                self.ax4.bar(years, year_counts, color='orange')
-                self.ax4.set_title('Year-wise Distribution')
-                self.ax4.set_xlabel('Year')
-                self.ax4.set_ylabel('Number of Students')
-            
-            # Adjust layout and refresh
-            self.fig.tight_layout()
-            self.canvas.draw()
-            
-        except Exception as e:
-            print(f"Analytics update error: {str(e)}")
+        """Schedule a dashboard refresh after data changes (the refresh itself is traced)"""
+        if self.dashboard is not None:
+            self.dashboard.schedule_refresh()
     
     def __del__(self):
         """Close database connection on exit"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        if hasattr(self, 'repository'):
+            self.repository.pool.close()
 
 # Main execution
 if __name__ == "__main__":
@@ -465,7 +550,7 @@ print("   - Full CRUD operations for student records")
 print("   - SQLite database integration")
 print("   - GUI with Tkinter")
 print("   - Data analytics with matplotlib")
-print("   - Excel export functionality")
+print("   - Streaming Excel/CSV/Parquet export")
 print("   - Report generation")
 print("   - Attendance tracking")
 print("   - Grade management")
\ No newline at end of file
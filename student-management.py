@@ -7,6 +7,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
 import os
+import student_db
+import tracing
+from student_backup import BackupScheduler
+from student_repository import StudentRepository
+
+COURSES = ['BCA', 'MCA', 'B.Tech', 'M.Tech', 'BSc CS']
+
+# Wait this long after the last keystroke before searching
+SEARCH_DELAY_MS = 250
 
 class StudentManagementSystem:
     def __init__(self, root):
@@ -25,28 +34,12 @@ class StudentManagementSystem:
         self.load_students()
     
     def init_database(self):
-        """Initialize SQLite database with student table"""
-        self.conn = sqlite3.connect('student_records.db')
-        self.cursor = self.conn.cursor()
-        
-        # Create students table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                roll_number TEXT UNIQUE NOT NULL,
-                email TEXT,
-                phone TEXT,
-                course TEXT,
-                year INTEGER,
-                attendance REAL DEFAULT 0,
-                grade REAL DEFAULT 0,
-                created_date TEXT,
-                updated_date TEXT
-            )
-        ''')
+        """Open the student repository (creates the database on first run)"""
+        self.repository = StudentRepository()
         
-        self.conn.commit()
+        # Daily online backups on a background thread
+        self.backups = BackupScheduler()
+        self.backups.start()
     
     def create_interface(self):
         """Create the main GUI interface"""
@@ -100,7 +93,7 @@ class StudentManagementSystem:
             
             # Entry
             if field_name in ['course']:
-                entry = ttk.Combobox(parent, values=['BCA', 'MCA', 'B.Tech', 'M.Tech', 'BSc CS'])
+                entry = ttk.Combobox(parent, values=COURSES)
                 entry.set('BCA')
             elif field_name == 'year':
                 entry = ttk.Combobox(parent, values=[1, 2, 3, 4])
@@ -134,9 +127,13 @@ class StudentManagementSystem:
                                   font=('Arial', 12, 'bold'), bg='#f0f0f0')
         list_frame.pack(fill='both', expand=True)
         
+        # Search bar
+        self.create_search_bar(list_frame)
+        
         # Treeview
         columns = ('ID', 'Name', 'Roll', 'Course', 'Year', 'Attendance', 'Grade')
-        self.tree = ttk.Treeview(list_frame, columns=columns, show='headings', height=15)
+        self.tree = ttk.Treeview(list_frame, columns=columns, show='headings', height=15,
+                                 selectmode='extended')
         
         # Define headings
         for col in columns:
@@ -162,6 +159,52 @@ class StudentManagementSystem:
         
         tk.Button(action_frame, text="Generate Report", command=self.generate_report,
                  bg='#e67e22', fg='white', font=('Arial', 10)).pack(side='left', padx=5)
+        tk.Button(action_frame, text="Bulk Edit", command=self.open_bulk_dialog,
+                 bg='#8e44ad', fg='white', font=('Arial', 10)).pack(side='left', padx=5)
+        self.undo_button = tk.Button(action_frame, text="Undo Bulk Edit", command=self.undo_bulk_edit,
+                                     bg='#95a5a6', fg='white', font=('Arial', 10), state='disabled')
+        self.undo_button.pack(side='left', padx=5)
+        tk.Button(action_frame, text="Backup Now", command=self.backup_now,
+                 bg='#2c3e50', fg='white', font=('Arial', 10)).pack(side='left', padx=5)
+    
+    def create_search_bar(self, parent):
+        """Create search box with course and year filters"""
+        search_frame = tk.Frame(parent, bg='#f0f0f0')
+        search_frame.pack(fill='x', pady=5)
+        
+        tk.Label(search_frame, text="Search:", font=('Arial', 10), bg='#f0f0f0').pack(side='left', padx=5)
+        self.search_var = tk.StringVar()
+        tk.Entry(search_frame, textvariable=self.search_var, font=('Arial', 10),
+                 width=30).pack(side='left', padx=5)
+        
+        tk.Label(search_frame, text="Course:", font=('Arial', 10), bg='#f0f0f0').pack(side='left', padx=5)
+        self.course_filter = ttk.Combobox(search_frame, values=['All'] + COURSES, width=8, state='readonly')
+        self.course_filter.set('All')
+        self.course_filter.pack(side='left', padx=5)
+        
+        tk.Label(search_frame, text="Year:", font=('Arial', 10), bg='#f0f0f0').pack(side='left', padx=5)
+        self.year_filter = ttk.Combobox(search_frame, values=['All', 1, 2, 3, 4], width=5, state='readonly')
+        self.year_filter.set('All')
+        self.year_filter.pack(side='left', padx=5)
+        
+        self.include_archived = tk.BooleanVar(value=False)
+        tk.Checkbutton(search_frame, text="Include archived", variable=self.include_archived,
+                       command=self.load_students, bg='#f0f0f0').pack(side='left', padx=5)
+        
+        self.search_status = tk.Label(search_frame, text="", font=('Arial', 9), bg='#f0f0f0', fg='#7f8c8d')
+        self.search_status.pack(side='left', padx=5)
+        
+        # Debounce keystrokes, filters apply immediately
+        self.search_job = None
+        self.search_var.trace_add('write', lambda *args: self.schedule_search())
+        self.course_filter.bind('<<ComboboxSelected>>', lambda event: self.load_students())
+        self.year_filter.bind('<<ComboboxSelected>>', lambda event: self.load_students())
+    
+    def schedule_search(self):
+        """Run the search once typing pauses"""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DELAY_MS, self.load_students)
     
     def add_student(self):
         """Add new student to database"""
@@ -175,16 +218,8 @@ class StudentManagementSystem:
                 return
             
             # Insert into database
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cursor.execute('''
-                INSERT INTO students (name, roll_number, email, phone, course, year, 
-                                    attendance, grade, created_date, updated_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (data['name'], data['roll_number'], data['email'], data['phone'],
-                  data['course'], data['year'], data['attendance'], data['grade'],
-                  current_time, current_time))
+            self.repository.add_student(data)
             
-            self.conn.commit()
             messagebox.showinfo("Success", "Student added successfully!")
             self.load_students()
             self.clear_fields()
@@ -209,15 +244,10 @@ class StudentManagementSystem:
             data = {key: entry.get() for key, entry in self.entries.items()}
             
             # Update database
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cursor.execute('''
-                UPDATE students SET name=?, email=?, phone=?, course=?, year=?, 
-                                  attendance=?, grade=?, updated_date=?
-                WHERE id=?
-            ''', (data['name'], data['email'], data['phone'], data['course'],
-                  data['year'], data['attendance'], data['grade'], current_time, student_id))
+            if not self.repository.update_student(student_id, data):
+                self.warn_unchanged(student_id, "updated")
+                return
             
-            self.conn.commit()
             messagebox.showinfo("Success", "Student updated successfully!")
             self.load_students()
             
@@ -234,14 +264,151 @@ class StudentManagementSystem:
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this student?"):
             try:
                 student_id = self.tree.item(selected[0])['values'][0]
-                self.cursor.execute('DELETE FROM students WHERE id=?', (student_id,))
-                self.conn.commit()
+                if not self.repository.delete_student(student_id):
+                    self.warn_unchanged(student_id, "deleted")
+                    return
                 messagebox.showinfo("Success", "Student deleted successfully!")
                 self.load_students()
                 self.clear_fields()
             except Exception as e:
                 messagebox.showerror("Error", f"An error occurred: {str(e)}")
     
+    def warn_unchanged(self, student_id, action):
+        """Explain why an update or delete touched no rows"""
+        if self.repository.get_student(student_id) is None:
+            messagebox.showwarning("Warning", f"This student no longer exists and can't be {action}.")
+            self.load_students()
+        else:
+            # Only live students can be edited; archived records are read-only
+            messagebox.showwarning("Warning", f"This student is archived (read-only) and can't be {action}.")
+    
+    def current_filters(self):
+        """Search text, course and year currently applied to the list"""
+        course = self.course_filter.get()
+        year = self.year_filter.get()
+        return (self.search_var.get().strip(),
+                None if course == 'All' else course,
+                None if year == 'All' else year)
+    
+    def bulk_target(self, scope):
+        """Repository arguments for the selected rows or everything matching the filters"""
+        if scope == 'selected':
+            return {'ids': [self.tree.item(item)['values'][0] for item in self.tree.selection()]}
+        text, course, year = self.current_filters()
+        return {'text': text, 'course': course, 'year': year}
+    
+    def open_bulk_dialog(self):
+        """Update or delete many students at once"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Bulk Edit")
+        dialog.configure(bg='#f0f0f0')
+        dialog.transient(self.root)
+        
+        selected_count = len(self.tree.selection())
+        scope = tk.StringVar(value='selected' if selected_count else 'filter')
+        tk.Label(dialog, text="Apply to:", font=('Arial', 10, 'bold'), bg='#f0f0f0').grid(
+            row=0, column=0, sticky='w', padx=10, pady=5)
+        tk.Radiobutton(dialog, text=f"Selected students ({selected_count})", variable=scope,
+                       value='selected', bg='#f0f0f0',
+                       state='normal' if selected_count else 'disabled').grid(row=1, column=0, columnspan=2, sticky='w', padx=10)
+        tk.Radiobutton(dialog, text="All students matching the current search and filters",
+                       variable=scope, value='filter', bg='#f0f0f0').grid(row=2, column=0, columnspan=2, sticky='w', padx=10)
+        
+        action = tk.StringVar(value='update')
+        tk.Label(dialog, text="Action:", font=('Arial', 10, 'bold'), bg='#f0f0f0').grid(
+            row=3, column=0, sticky='w', padx=10, pady=5)
+        tk.Radiobutton(dialog, text="Set", variable=action, value='update', bg='#f0f0f0').grid(
+            row=4, column=0, sticky='w', padx=10)
+        field = ttk.Combobox(dialog, values=['course', 'year', 'attendance', 'grade', 'email', 'phone'],
+                             width=12, state='readonly')
+        field.set('year')
+        field.grid(row=4, column=1, padx=5)
+        tk.Label(dialog, text="to", bg='#f0f0f0').grid(row=4, column=2)
+        value = tk.Entry(dialog, font=('Arial', 10), width=12)
+        value.grid(row=4, column=3, padx=(5, 10))
+        tk.Radiobutton(dialog, text="Delete students", variable=action, value='delete', bg='#f0f0f0').grid(
+            row=5, column=0, columnspan=2, sticky='w', padx=10)
+        
+        preview = tk.Label(dialog, text="", font=('Arial', 10), bg='#f0f0f0', fg='#2c3e50')
+        preview.grid(row=6, column=0, columnspan=4, pady=5)
+        
+        def update_preview(*args):
+            count = self.repository.count_students(**self.bulk_target(scope.get()))
+            verb = "deleted" if action.get() == 'delete' else "updated"
+            preview.config(text=f"{count} students will be {verb}")
+        
+        def apply():
+            target = self.bulk_target(scope.get())
+            count = self.repository.count_students(**target)
+            if not count:
+                messagebox.showwarning("Warning", "No students match!", parent=dialog)
+                return
+            try:
+                if action.get() == 'delete':
+                    if not messagebox.askyesno("Confirm", f"Delete {count} students?", parent=dialog):
+                        return
+                    changed = self.repository.bulk_delete(**target)
+                else:
+                    if not messagebox.askyesno("Confirm", f"Set {field.get()} to '{value.get()}' for {count} students?",
+                                               parent=dialog):
+                        return
+                    changed = self.repository.bulk_update({field.get(): value.get()}, **target)
+            except Exception as e:
+                messagebox.showerror("Error", f"An error occurred: {str(e)}", parent=dialog)
+                return
+            
+            dialog.destroy()
+            # One reload for the whole batch
+            self.load_students()
+            self.clear_fields()
+            self.update_undo_button()
+            messagebox.showinfo("Success", f"{changed} students changed. Use Undo Bulk Edit to revert.")
+        
+        scope.trace_add('write', update_preview)
+        action.trace_add('write', update_preview)
+        update_preview()
+        
+        tk.Button(dialog, text="Apply", command=apply, bg='#8e44ad', fg='white',
+                  font=('Arial', 10, 'bold'), width=10).grid(row=7, column=0, columnspan=2, pady=10)
+        tk.Button(dialog, text="Cancel", command=dialog.destroy, bg='#95a5a6', fg='white',
+                  font=('Arial', 10, 'bold'), width=10).grid(row=7, column=2, columnspan=2, pady=10)
+    
+    def undo_bulk_edit(self):
+        """Revert the most recent bulk edit"""
+        description = self.repository.undo_description()
+        if description and messagebox.askyesno("Confirm", f"Undo the {description}?"):
+            try:
+                self.repository.undo_last()
+                self.load_students()
+            except Exception as e:
+                messagebox.showerror("Error", f"Undo failed: {str(e)}")
+        self.update_undo_button()
+    
+    def update_undo_button(self):
+        description = self.repository.undo_description()
+        self.undo_button.config(state='normal' if description else 'disabled',
+                                bg='#16a085' if description else '#95a5a6')
+    
+    def backup_now(self):
+        """Take a backup without waiting for the daily schedule"""
+        self.backups.backup_now()
+        self.search_status.config(text="Backing up...")
+        self.root.after(500, self.poll_backup, self.backups.last_result)
+    
+    def poll_backup(self, previous):
+        """Report the backup once the background thread has finished it"""
+        if self.backups.running or (self.backups.last_result is previous and self.backups.error is None):
+            self.root.after(500, self.poll_backup, previous)
+            return
+        
+        self.search_status.config(text="")
+        if self.backups.error:
+            messagebox.showerror("Error", f"Backup failed: {self.backups.error}")
+        else:
+            result = self.backups.last_result
+            messagebox.showinfo("Success", f"Backup saved to {result['path']} "
+                                f"({result['backup_bytes'] / 1e6:.1f} MB, {result['seconds']:.1f}s)")
+    
     def clear_fields(self):
         """Clear all form fields"""
         for entry in self.entries.values():
@@ -250,52 +417,62 @@ class StudentManagementSystem:
             else:
                 entry.delete(0, tk.END)
     
+    @tracing.traced()
     def load_students(self):
-        """Load students into treeview"""
+        """Load students matching the current search into treeview"""
+        self.search_job = None
+        
         # Clear existing data
         for item in self.tree.get_children():
             self.tree.delete(item)
         
+        text, course, year = self.current_filters()
+        
         # Fetch from database
-        self.cursor.execute('SELECT id, name, roll_number, course, year, attendance, grade FROM students')
-        for row in self.cursor.fetchall():
+        include_archived = self.include_archived.get()
+        if text or course or year:
+            rows = self.repository.search(text, course, year, include_archived=include_archived)
+            if len(rows) == student_db.PAGE_SIZE:
+                self.search_status.config(text=f"Showing first {len(rows)} matches")
+            else:
+                self.search_status.config(text=f"{len(rows)} matches")
+        else:
+            rows = self.repository.search(limit=None, include_archived=include_archived)
+            self.search_status.config(text="")
+        
+        for row in rows:
             self.tree.insert('', tk.END, values=row)
     
+    @tracing.traced()
     def on_select(self, event):
         """Handle treeview selection"""
         selected = self.tree.selection()
         if selected:
             # Get student data
             student_id = self.tree.item(selected[0])['values'][0]
-            self.cursor.execute('SELECT * FROM students WHERE id=?', (student_id,))
-            student = self.cursor.fetchone()
+            student = self.repository.get_student(student_id)
             
             if student:
                 # Populate form fields
                 fields = ['name', 'roll_number', 'email', 'phone', 'course', 'year', 'attendance', 'grade']
-                for i, field in enumerate(fields):
+                for field in fields:
                     entry = self.entries[field]
                     if isinstance(entry, ttk.Combobox):
-                        entry.set(str(student[i + 1]))
+                        entry.set(str(student[field]))
                     else:
                         entry.delete(0, tk.END)
-                        entry.insert(0, str(student[i + 1]) if student[i + 1] else '')
+                        entry.insert(0, str(student[field]) if student[field] else '')
     
+    @tracing.traced()
     def generate_report(self):
         """Generate comprehensive report"""
         try:
-            # Get statistics
-            self.cursor.execute('SELECT COUNT(*) FROM students')
-            total_students = self.cursor.fetchone()[0]
-            
-            self.cursor.execute('SELECT AVG(attendance) FROM students WHERE attendance > 0')
-            avg_attendance = self.cursor.fetchone()[0] or 0
-            
-            self.cursor.execute('SELECT AVG(grade) FROM students WHERE grade > 0')
-            avg_grade = self.cursor.fetchone()[0] or 0
-            
-            self.cursor.execute('SELECT course, COUNT(*) FROM students GROUP BY course')
-            course_stats = self.cursor.fetchall()
+            # Get statistics from the trigger-maintained summary tables
+            summary = self.repository.report()
+            total_students = summary['total_students']
+            avg_attendance = summary['avg_attendance']
+            avg_grade = summary['avg_grade']
+            course_stats = summary['courses']
             
             # Create report
             report = f"""SMART STUDENT MANAGEMENT SYSTEM REPORT
@@ -312,6 +489,12 @@ Average Grade: {avg_grade:.2f}/10
             for course, count in course_stats:
                 report += f"{course}: {count} students\n"
             
+            # Cohort analytics (needs NumPy)
+            try:
+                report += "\n=== COHORT ANALYTICS ===\n" + self.repository.cohort_report()
+            except ImportError:
+                pass
+            
             # Save report
             filename = filedialog.asksaveasfilename(
                 defaultextension=".txt",
@@ -328,8 +511,10 @@ Average Grade: {avg_grade:.2f}/10
     
     def __del__(self):
         """Close database connection on exit"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        if hasattr(self, 'backups'):
+            self.backups.stop()
+        if hasattr(self, 'repository'):
+            self.repository.pool.close()
 
 # Main execution
 if __name__ == "__main__":
@@ -346,6 +531,10 @@ if __name__ == "__main__":
 # Features:
 # - Add, update, delete student records
 # - Search and filter students
+# - Bulk update/delete of selected or filtered students with undo
+# - Archived students stay searchable (python student_archive.py --help)
+# - Daily and on-demand online backups (python student_backup.py --help)
+# - Optional tracing of slow operations (TRACE=trace.json, see tracing.py)
 # - Generate reports
 # - Data persistence with SQLite
 # - Professional GUI interface
@@ -0,0 +1,325 @@
+# Vectorized Cohort Analytics for Student Records
+# Author: Ajay Mondal
+# Technologies: Python, NumPy, SQLite
+
+import threading
+
+import numpy as np
+
+import student_db
+
+# At-risk thresholds
+AT_RISK_ATTENDANCE = 75
+AT_RISK_GRADE = 5
+
+COHORT_PERCENTILES = [25, 50, 75, 90]
+
+
+class StudentColumns:
+    """Column arrays for every student, loaded with a single query"""
+
+    def __init__(self, ids, course_codes, course_names, years, attendance, grade):
+        self.ids = ids
+        self.attendance = attendance
+        self.grade = grade
+
+        # Renumber courses in name order, dropping names no student uses any more
+        names = np.asarray(course_names, dtype=str)
+        by_name = np.empty(len(names), dtype=np.int64)
+        by_name[np.argsort(names)] = np.arange(len(names))
+        course_codes = by_name[course_codes]
+        used = np.bincount(course_codes, minlength=len(names)) > 0
+        self.course_names = np.sort(names)[used]
+        course_codes = (np.cumsum(used) - 1)[course_codes]
+
+        # Integer codes make (course, year) cohorts a single group key
+        self.year_values, year_codes = np.unique(years, return_inverse=True)
+        self.cohort_count = len(self.course_names) * len(self.year_values)
+        cohort = course_codes * len(self.year_values) + year_codes
+        # Small unsigned codes let NumPy radix-sort by cohort
+        self.cohort = cohort.astype(np.min_scalar_type(max(self.cohort_count - 1, 0)))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def cohort_label(self, cohort):
+        course = self.course_names[cohort // len(self.year_values)]
+        year = self.year_values[cohort % len(self.year_values)]
+        return str(course), int(year)
+
+
+# One students row as read for analytics; NULL reads as NaN
+ROW_DTYPE = np.dtype([('id', np.int64), ('course', np.int64), ('year', np.int64),
+                      ('attendance', np.float64), ('grade', np.float64)])
+
+
+def read_rows(conn, course_names, where='1', params=()):
+    """Matching students as a ROW_DTYPE array, typed in SQL
+
+    Courses come back as indexes into course_names, which gains any new
+    names first. Blank, text and zero attendance or grade become NULL, the
+    same "not entered" rule as the summary tables.
+    """
+    for (name,) in conn.execute(f"SELECT DISTINCT IFNULL(course, '') FROM students WHERE {where}", params):
+        if name not in course_names:
+            course_names.append(name)
+    cases = ' '.join(f'WHEN ? THEN {code}' for code in range(len(course_names)))
+    course_code = f"CASE IFNULL(course, '') {cases} ELSE 0 END" if course_names else '0'
+
+    rows = conn.execute(f'''
+        SELECT id, {course_code},
+               CASE WHEN typeof(year) = 'integer' THEN year ELSE 0 END,
+               CASE WHEN {student_db.is_positive('attendance')} THEN attendance END,
+               CASE WHEN {student_db.is_positive('grade')} THEN grade END
+        FROM students WHERE {where} ORDER BY id
+    ''', list(course_names) + list(params)).fetchall()
+    # One conversion for the whole result instead of one per column
+    return np.array(rows, dtype=ROW_DTYPE)
+
+
+def to_columns(rows, course_names):
+    return StudentColumns(rows['id'], rows['course'], course_names, rows['year'],
+                          rows['attendance'], rows['grade'])
+
+
+def load_columns(conn):
+    """Read the analytics columns of the students table into NumPy arrays"""
+    course_names = []
+    return to_columns(read_rows(conn, course_names), course_names)
+
+
+class ColumnSnapshot:
+    """Analytics columns kept in memory and patched from the change log
+
+    The first load reads every student; later loads only re-read the
+    students changed since the snapshot's database version.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.rows = None
+        self.course_names = []
+
+    def load(self, conn):
+        """Current StudentColumns, bringing the snapshot up to date first"""
+        with self.lock:
+            # One read transaction, so the version matches the rows read
+            conn.execute('BEGIN')
+            try:
+                version = student_db.get_data_version(conn)
+                if version != self.version:
+                    if not self.patch(conn):
+                        self.course_names = []
+                        self.rows = read_rows(conn, self.course_names)
+                    self.version = version
+            finally:
+                conn.rollback()
+            return to_columns(self.rows, self.course_names)
+
+    def patch(self, conn):
+        """Apply the changes logged since the snapshot; False if a full load is needed"""
+        if self.rows is None or self.version is None:
+            return False
+        # Changes after our version must all still be in the log
+        first = conn.execute('SELECT MIN(seq) FROM student_changes WHERE seq > ?', (self.version,)).fetchone()[0]
+        if first is None or first != self.version + 1:
+            return False
+
+        changed = np.array([row[0] for row in conn.execute(
+            'SELECT DISTINCT student_id FROM student_changes WHERE seq > ? ORDER BY student_id',
+            (self.version,))], dtype=np.int64)
+        # Past this point re-reading everything is cheaper
+        if len(changed) > len(self.rows) // 2:
+            return False
+        where, params = student_db.filter_condition(ids=changed.tolist())
+        fresh = read_rows(conn, self.course_names, where, params)
+
+        # Copy, because columns handed out earlier may still be in use
+        rows = self.rows.copy()
+        positions, found = locate(rows['id'], fresh['id'])
+        rows[positions[found]] = fresh[found]
+
+        # Deleted or archived students go, new ones are inserted in id order
+        positions, present = locate(rows['id'], changed)
+        gone = present & ~np.isin(changed, fresh['id'])
+        if gone.any():
+            rows = np.delete(rows, positions[gone])
+        added = fresh[~found]
+        if len(added):
+            rows = np.insert(rows, np.searchsorted(rows['id'], added['id']), added)
+        self.rows = rows
+        return True
+
+
+def locate(sorted_ids, wanted):
+    """Positions of wanted ids in a sorted id array, and which of them are there"""
+    positions = np.searchsorted(sorted_ids, wanted)
+    found = positions < len(sorted_ids)
+    found[found] = sorted_ids[positions[found]] == wanted[found]
+    return positions, found
+
+
+def cohort_order(cohort, values):
+    """Indexes sorting by cohort, then by value within each cohort
+
+    Same result as np.lexsort((values, cohort)) up to the order of equal
+    values: a quicksort on the values, then a stable radix sort on the small
+    cohort codes.
+    """
+    order = np.argsort(values)
+    return order[np.argsort(cohort[order], kind='stable')]
+
+
+def cohort_percentiles(columns, values, percentiles=COHORT_PERCENTILES):
+    """Percentiles of values per cohort, shape (cohorts, len(percentiles)), NaN for empty cohorts"""
+    valid = ~np.isnan(values)
+    cohort = columns.cohort[valid]
+    values = values[valid]
+
+    # Sort by cohort, then by value within each cohort
+    order = cohort_order(cohort, values)
+    sorted_values = values[order]
+    counts = np.bincount(cohort, minlength=columns.cohort_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    result = np.full((columns.cohort_count, len(percentiles)), np.nan)
+    has_data = counts > 0
+    for index, p in enumerate(percentiles):
+        # Linear interpolation between the two closest ranks, like np.percentile
+        position = (counts[has_data] - 1) * p / 100
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts[has_data] - 1)
+        fraction = position - lower
+        low_values = sorted_values[starts[has_data] + lower]
+        high_values = sorted_values[starts[has_data] + upper]
+        result[has_data, index] = low_values + (high_values - low_values) * fraction
+    return result
+
+
+def cohort_means(columns, values):
+    """Mean of the valid values per cohort and how many values there were"""
+    valid = ~np.isnan(values)
+    counts = np.bincount(columns.cohort[valid], minlength=columns.cohort_count)
+    sums = np.bincount(columns.cohort[valid], weights=values[valid], minlength=columns.cohort_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts, counts
+
+
+def correlation(columns):
+    """Pearson correlation of grade and attendance, overall and per cohort"""
+    valid = ~np.isnan(columns.grade) & ~np.isnan(columns.attendance)
+    x = columns.attendance[valid]
+    y = columns.grade[valid]
+    cohort = columns.cohort[valid]
+    size = columns.cohort_count
+
+    # Group sums give every cohort's correlation in one pass
+    n = np.bincount(cohort, minlength=size).astype(np.float64)
+    sx = np.bincount(cohort, weights=x, minlength=size)
+    sy = np.bincount(cohort, weights=y, minlength=size)
+    sxx = np.bincount(cohort, weights=x * x, minlength=size)
+    syy = np.bincount(cohort, weights=y * y, minlength=size)
+    sxy = np.bincount(cohort, weights=x * y, minlength=size)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = n * sxy - sx * sy
+        per_cohort = covariance / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+
+    overall = np.corrcoef(x, y)[0, 1] if len(x) > 1 else np.nan
+    return overall, per_cohort
+
+
+def at_risk_mask(columns):
+    """Students below both the attendance and grade thresholds"""
+    return (columns.attendance < AT_RISK_ATTENDANCE) & (columns.grade < AT_RISK_GRADE)
+
+
+def cohort_ranks(columns):
+    """Grade rank of every student within their cohort (1 = best, ties share a rank, 0 = no grade)"""
+    valid = ~np.isnan(columns.grade)
+    positions = np.flatnonzero(valid)
+    cohort = columns.cohort[valid]
+    grade = columns.grade[valid]
+
+    # Highest grade first inside each cohort
+    order = cohort_order(cohort, -grade)
+    sorted_cohort = cohort[order]
+    sorted_grade = grade[order]
+
+    index = np.arange(len(order))
+    new_cohort = np.ones(len(order), dtype=bool)
+    new_cohort[1:] = sorted_cohort[1:] != sorted_cohort[:-1]
+    new_value = new_cohort.copy()
+    new_value[1:] |= sorted_grade[1:] != sorted_grade[:-1]
+
+    cohort_start = np.maximum.accumulate(np.where(new_cohort, index, 0))
+    tie_start = np.maximum.accumulate(np.where(new_value, index, 0))
+
+    ranks = np.zeros(len(columns), dtype=np.int64)
+    ranks[positions[order]] = tie_start - cohort_start + 1
+    return ranks
+
+
+def compute_cohort_analytics(columns):
+    """Everything the report and dashboard need, computed without per-row loops"""
+    grade_percentiles = cohort_percentiles(columns, columns.grade)
+    attendance_percentiles = cohort_percentiles(columns, columns.attendance)
+    grade_means, _ = cohort_means(columns, columns.grade)
+    overall_correlation, cohort_correlation = correlation(columns)
+    risk_mask = at_risk_mask(columns)
+    ranks = cohort_ranks(columns)
+
+    risk_counts = np.bincount(columns.cohort[risk_mask], minlength=columns.cohort_count)
+    sizes = np.bincount(columns.cohort, minlength=columns.cohort_count)
+
+    cohorts = []
+    for cohort in np.flatnonzero(sizes):
+        course, year = columns.cohort_label(cohort)
+        cohorts.append({
+            'course': course,
+            'year': year,
+            'students': int(sizes[cohort]),
+            'mean_grade': float(grade_means[cohort]),
+            'grade_percentiles': dict(zip(COHORT_PERCENTILES, grade_percentiles[cohort].tolist())),
+            'attendance_percentiles': dict(zip(COHORT_PERCENTILES, attendance_percentiles[cohort].tolist())),
+            'correlation': float(cohort_correlation[cohort]),
+            'at_risk': int(risk_counts[cohort]),
+        })
+
+    return {
+        'students': len(columns),
+        'correlation': float(overall_correlation),
+        'at_risk_ids': columns.ids[risk_mask],
+        'ranks': {'ids': columns.ids, 'ranks': ranks},
+        'cohorts': cohorts,
+    }
+
+
+def load_cohort_analytics(conn):
+    """Load the columns and compute the cohort analytics"""
+    return compute_cohort_analytics(load_columns(conn))
+
+
+def format_report(analytics):
+    """Text section for generate_report()"""
+    def fmt(value):
+        return '-' if np.isnan(value) else f'{value:.2f}'
+
+    lines = [
+        f"Grade-attendance correlation: {fmt(analytics['correlation'])}",
+        f"At-risk students (attendance < {AT_RISK_ATTENDANCE}% and grade < {AT_RISK_GRADE}): "
+        f"{len(analytics['at_risk_ids'])}",
+        '',
+        f"{'Course':<10}{'Year':>5}{'Students':>10}{'Median':>8}{'P25':>7}{'P75':>7}{'P90':>7}"
+        f"{'Att. med':>10}{'r':>7}{'At risk':>9}",
+    ]
+    for cohort in analytics['cohorts']:
+        grades = cohort['grade_percentiles']
+        lines.append(
+            f"{cohort['course'] or '-':<10}{cohort['year']:>5}{cohort['students']:>10}"
+            f"{fmt(grades[50]):>8}{fmt(grades[25]):>7}{fmt(grades[75]):>7}{fmt(grades[90]):>7}"
+            f"{fmt(cohort['attendance_percentiles'][50]):>10}{fmt(cohort['correlation']):>7}"
+            f"{cohort['at_risk']:>9}"
+        )
+    return '\n'.join(lines) + '\n'
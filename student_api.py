@@ -0,0 +1,122 @@
+# Student Records REST API
+# Author: Ajay Mondal
+# Technologies: Python, Flask, SQLite
+
+import sqlite3
+
+from flask import Flask, request, jsonify
+
+from student_repository import StudentRepository
+
+app = Flask(__name__)
+
+# Request threads borrow connections from the repository's bounded pool
+repository = StudentRepository()
+
+# Page size bounds for GET /students
+MAX_LIMIT = 1000
+
+
+def error_response(message, status=400):
+    return jsonify({
+        'success': False,
+        'error': message
+    }), status
+
+
+def int_arg(name, default, low, high=None):
+    """An integer query parameter clamped to [low, high]; ValueError if it isn't an integer"""
+    value = request.args.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer") from None
+    value = max(low, value)
+    return value if high is None else min(value, high)
+
+
+@app.route('/students', methods=['GET'])
+def list_students():
+    """Search students by text, course and year (archived=1 includes archives)"""
+    try:
+        rows = repository.search(
+            request.args.get('q', ''),
+            request.args.get('course') or None,
+            request.args.get('year') or None,
+            # SQLite reads a negative LIMIT as "no limit", so never pass one through
+            limit=int_arg('limit', 50, 1, MAX_LIMIT),
+            offset=int_arg('offset', 0, 0),
+            include_archived=request.args.get('archived') == '1'
+        )
+        columns = ['id', 'name', 'roll_number', 'course', 'year', 'attendance', 'grade']
+        return jsonify({
+            'success': True,
+            'students': [dict(zip(columns, row)) for row in rows]
+        })
+    except Exception as e:
+        return error_response(str(e))
+
+
+@app.route('/students/<int:student_id>', methods=['GET'])
+def get_student(student_id):
+    """Get one student record"""
+    student = repository.get_student(student_id)
+    if student is None:
+        return error_response('Student not found', 404)
+    return jsonify({'success': True, 'student': student})
+
+
+@app.route('/students', methods=['POST'])
+def add_student():
+    """Add a new student"""
+    try:
+        student_id = repository.add_student(request.get_json())
+        return jsonify({'success': True, 'id': student_id}), 201
+    except sqlite3.IntegrityError:
+        return error_response('Roll number already exists!', 409)
+    except Exception as e:
+        return error_response(str(e))
+
+
+@app.route('/students/<int:student_id>', methods=['PUT'])
+def update_student(student_id):
+    """Update an existing student"""
+    try:
+        if not repository.update_student(student_id, request.get_json()):
+            return error_response('Student not found', 404)
+        return jsonify({'success': True})
+    except Exception as e:
+        return error_response(str(e))
+
+
+@app.route('/students/<int:student_id>', methods=['DELETE'])
+def delete_student(student_id):
+    """Delete a student"""
+    try:
+        if not repository.delete_student(student_id):
+            return error_response('Student not found', 404)
+        return jsonify({'success': True})
+    except Exception as e:
+        return error_response(str(e))
+
+
+@app.route('/report')
+def report():
+    """Summary statistics and course distribution"""
+    return jsonify({'success': True, 'report': repository.report()})
+
+
+@app.route('/analytics')
+def analytics():
+    """Numbers behind the dashboard charts"""
+    return jsonify({'success': True, 'analytics': repository.analytics()})
+
+
+if __name__ == '__main__':
+    print("🌐 Student Records API at: http://localhost:5001")
+    app.run(port=5001, threaded=True)
+
+# To run this API:
+# 1. Install requirements: pip install flask
+# 2. Run: python student_api.py
+# 3. Try: curl "http://localhost:5001/students?q=ajay&course=BCA"
@@ -0,0 +1,220 @@
+# Archive Databases for Graduated and Inactive Students
+# Author: Ajay Mondal
+# Technologies: Python, SQLite (ATTACH)
+
+import argparse
+import glob
+import heapq
+import itertools
+import os
+import re
+from contextlib import contextmanager
+
+import student_db
+
+ARCHIVE_PREFIX = 'students_archive_'
+
+# SQLite attaches at most 10 databases to one connection by default
+MAX_ATTACHED = 10
+
+
+def archive_dir(db_path=student_db.DB_PATH):
+    """Archive files live in an 'archive' folder next to the main database"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'archive')
+
+
+def archive_path(label, db_path=student_db.DB_PATH):
+    safe_label = re.sub(r'[^\w.-]+', '-', str(label)).strip('-')
+    if not safe_label:
+        raise ValueError("Archive label is required!")
+    return os.path.join(archive_dir(db_path), f'{ARCHIVE_PREFIX}{safe_label}.db')
+
+
+def list_archives(db_path=student_db.DB_PATH):
+    """Archive files for this database, oldest label first"""
+    return sorted(glob.glob(os.path.join(archive_dir(db_path), f'{ARCHIVE_PREFIX}*.db')))
+
+
+def init_archive_schema(conn, schema):
+    """Plain copies of the student and attendance tables plus a search index, no triggers"""
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {schema}.students (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            roll_number TEXT NOT NULL,
+            email TEXT,
+            phone TEXT,
+            course TEXT,
+            year INTEGER,
+            attendance REAL DEFAULT 0,
+            grade REAL DEFAULT 0,
+            created_date TEXT,
+            updated_date TEXT,
+            archived_date TEXT DEFAULT (datetime('now'))
+        )
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_students_course_year ON students (course, year)')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {schema}.attendance_days (
+            student_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            status INTEGER NOT NULL,
+            PRIMARY KEY (student_id, day)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {schema}.students_fts USING fts5(
+            name, roll_number, email,
+            content='students', content_rowid='id',
+            prefix='2 3'
+        )
+    ''')
+
+
+def archive_students(conn, label, db_path=student_db.DB_PATH, text='', course=None, year=None,
+                     inactive_before=None):
+    """Move matching students and their attendance history into an archive file
+
+    Returns the number of students moved.
+    """
+    where, params = student_db.filter_condition(text, course, year)
+    if inactive_before:
+        where += ' AND updated_date < ?'
+        params.append(inactive_before)
+
+    path = archive_path(label, db_path)
+    # No archive file for a filter that matches nobody
+    if not conn.execute(f'SELECT EXISTS (SELECT 1 FROM main.students WHERE {where})', params).fetchone()[0]:
+        return 0
+    created = not os.path.exists(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn.execute('ATTACH DATABASE ? AS archive_target', (path,))
+    try:
+        init_archive_schema(conn, 'archive_target')
+        columns = ', '.join(student_db.STUDENT_COLUMNS)
+
+        # Copy and delete share one write transaction, so no other writer can change the
+        # matching rows in between, and only the ids actually copied are deleted
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(f'CREATE TEMP TABLE archive_ids AS SELECT id FROM main.students WHERE {where}',
+                         params)
+            conn.execute(f'''
+                INSERT OR REPLACE INTO archive_target.students ({columns})
+                SELECT {columns} FROM main.students WHERE id IN (SELECT id FROM temp.archive_ids)
+            ''')
+            conn.execute('''
+                INSERT OR REPLACE INTO archive_target.attendance_days (student_id, day, status)
+                SELECT student_id, day, status FROM main.attendance_days
+                WHERE student_id IN (SELECT id FROM temp.archive_ids)
+            ''')
+            conn.execute("INSERT INTO archive_target.students_fts (students_fts) VALUES ('rebuild')")
+
+            last_change = student_db.get_data_version(conn)
+            moved = conn.execute('DELETE FROM main.students WHERE id IN (SELECT id FROM temp.archive_ids)'
+                                 ).rowcount
+            # Tell change-log consumers these students were archived, not deleted
+            conn.execute("UPDATE main.student_changes SET op = 'A' WHERE seq > ? AND op = 'D'",
+                         (last_change,))
+            conn.execute('DROP TABLE temp.archive_ids')
+    finally:
+        conn.execute('DROP TABLE IF EXISTS temp.archive_ids')
+        conn.execute('DETACH DATABASE archive_target')
+
+    # Another writer emptied the match in between; don't leave an empty file behind
+    if created and not moved:
+        os.remove(path)
+    return moved
+
+
+def archive_batches(db_path=student_db.DB_PATH):
+    """Archive files in groups small enough to attach next to the main database"""
+    paths = list_archives(db_path)
+    size = MAX_ATTACHED - 1
+    return [paths[i:i + size] for i in range(0, len(paths), size)]
+
+
+@contextmanager
+def attached(conn, paths):
+    """Attach archive files for one query and detach them afterwards; yields the schema names"""
+    schemas = []
+    try:
+        for n, path in enumerate(paths):
+            conn.execute(f'ATTACH DATABASE ? AS archive_{n}', (path,))
+            schemas.append(f'archive_{n}')
+        yield schemas
+    finally:
+        for schema in schemas:
+            conn.execute(f'DETACH DATABASE {schema}')
+
+
+def search_with_archives(conn, text='', course=None, year=None, limit=student_db.PAGE_SIZE, offset=0,
+                         db_path=student_db.DB_PATH, columns=student_db.LIST_COLUMNS):
+    """Like student_db.search_students, over the live table and every archive file
+
+    Archives are searched a batch at a time (SQLite caps attached databases)
+    and the id-ordered results are merged.
+    """
+    # A negative LIMIT means no limit to SQLite, so it does here too
+    window = None if limit is None or limit < 0 else offset + limit
+    results = []
+    for index, paths in enumerate(archive_batches(db_path) or [[]]):
+        with attached(conn, paths) as schemas:
+            # The live table is searched once, alongside the first batch
+            parts = []
+            params = []
+            for schema in (['main'] if index == 0 else []) + schemas:
+                query, query_params = student_db.search_query(text, course, year, columns, schema)
+                parts.append(query)
+                params.extend(query_params)
+
+            query = f"SELECT * FROM ({' UNION ALL '.join(parts)}) ORDER BY 1"
+            if window is not None:
+                query += ' LIMIT ?'
+                params.append(window)
+            results.append(conn.execute(query, params).fetchall())
+
+    rows = heapq.merge(*results, key=lambda row: row[0])
+    return list(itertools.islice(rows, offset, window))
+
+
+def find_archived_student(conn, student_id, db_path=student_db.DB_PATH):
+    """Full record of an archived student, or None"""
+    for paths in archive_batches(db_path):
+        with attached(conn, paths) as schemas:
+            for schema in schemas:
+                row = conn.execute(f'SELECT {student_db.RECORD_COLUMNS} FROM {schema}.students s WHERE id=?',
+                                   (student_id,)).fetchone()
+                if row:
+                    return row
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move graduated or inactive students into an archive file")
+    parser.add_argument('label', help="archive name, e.g. 2026-graduates")
+    parser.add_argument('--db', default=student_db.DB_PATH, help="student database")
+    parser.add_argument('--course', help="only this course")
+    parser.add_argument('--year', type=int, help="only this year of study")
+    parser.add_argument('--inactive-before', metavar='YYYY-MM-DD',
+                        help="only students not updated since this date")
+    args = parser.parse_args(argv)
+
+    if not (args.course or args.year or args.inactive_before):
+        parser.error("give at least one of --course, --year or --inactive-before")
+
+    conn = student_db.connect(args.db)
+    try:
+        moved = archive_students(conn, args.label, args.db, course=args.course, year=args.year,
+                                 inactive_before=args.inactive_before)
+    finally:
+        conn.close()
+    print(f"✅ {moved} students moved to {archive_path(args.label, args.db)}")
+
+
+if __name__ == '__main__':
+    main()
+
+# To archive a graduated cohort:
+# 1. Run: python student_archive.py 2026-graduates --year 4
+# 2. Tick "Include archived" in the app to search them again
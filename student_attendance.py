@@ -0,0 +1,178 @@
+# Daily Attendance Ingestion and Rollup
+# Author: Ajay Mondal
+# Technologies: Python, SQLite
+
+from datetime import date, datetime
+
+# Stored as small integers; anything above ABSENT counts as attended
+ABSENT = 0
+PRESENT = 1
+LATE = 2
+
+STATUS_CODES = {
+    'absent': ABSENT,
+    'present': PRESENT,
+    'late': LATE,
+}
+
+
+def init_attendance_tables(cursor):
+    """Create compact attendance storage and the per-student running totals"""
+    # One row per student per day, clustered on (student_id, day)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attendance_days (
+            student_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            status INTEGER NOT NULL,
+            PRIMARY KEY (student_id, day)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_attendance_days_day ON attendance_days (day)')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attendance_totals (
+            student_id INTEGER PRIMARY KEY,
+            days_present INTEGER NOT NULL DEFAULT 0,
+            days_total INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    # Roll totals forward one mark at a time instead of rescanning history
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS attendance_days_insert AFTER INSERT ON attendance_days BEGIN
+            INSERT INTO attendance_totals (student_id, days_present, days_total)
+            VALUES (new.student_id, new.status > {ABSENT}, 1)
+            ON CONFLICT (student_id) DO UPDATE SET
+                days_present = days_present + (new.status > {ABSENT}),
+                days_total = days_total + 1;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS attendance_days_update AFTER UPDATE OF status ON attendance_days
+        WHEN (old.status > {ABSENT}) != (new.status > {ABSENT}) BEGIN
+            UPDATE attendance_totals
+            SET days_present = days_present - (old.status > {ABSENT}) + (new.status > {ABSENT})
+            WHERE student_id = new.student_id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS attendance_days_delete AFTER DELETE ON attendance_days BEGIN
+            UPDATE attendance_totals
+            SET days_present = days_present - (old.status > {ABSENT}),
+                days_total = days_total - 1
+            WHERE student_id = old.student_id;
+        END
+    ''')
+
+    # Drop a student's history along with the student
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_attendance_delete AFTER DELETE ON students BEGIN
+            DELETE FROM attendance_days WHERE student_id = old.id;
+            DELETE FROM attendance_totals WHERE student_id = old.id;
+        END
+    ''')
+
+    # Copy the new percentage onto the student record
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS attendance_totals_insert AFTER INSERT ON attendance_totals BEGIN
+            UPDATE students SET attendance = ROUND(new.days_present * 100.0 / new.days_total, 2)
+            WHERE id = new.student_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS attendance_totals_update AFTER UPDATE ON attendance_totals BEGIN
+            UPDATE students SET attendance = CASE WHEN new.days_total > 0
+                THEN ROUND(new.days_present * 100.0 / new.days_total, 2) ELSE 0 END
+            WHERE id = new.student_id;
+        END
+    ''')
+
+
+def date_key(value=None):
+    """Convert a date, datetime or 'YYYY-MM-DD' string to an integer key like 20261019"""
+    if value is None:
+        value = date.today()
+    elif isinstance(value, str):
+        value = datetime.strptime(value, '%Y-%m-%d').date()
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def status_code(status):
+    """Accept status names or codes"""
+    if isinstance(status, str):
+        return STATUS_CODES[status.strip().lower()]
+    return int(status)
+
+
+def write_marks(conn, day, statuses):
+    """Write (student_id, status) pairs for one day inside the caller's transaction"""
+    day = day if isinstance(day, int) else date_key(day)
+    rows = [(student_id, day, status_code(status)) for student_id, status in statuses]
+    conn.executemany('''
+        INSERT INTO attendance_days (student_id, day, status) VALUES (?, ?, ?)
+        ON CONFLICT (student_id, day) DO UPDATE SET status = excluded.status
+    ''', rows)
+    return len(rows)
+
+
+def mark_attendance(conn, day, statuses):
+    """Write (student_id, status) pairs for one day in a single transaction"""
+    with conn:
+        return write_marks(conn, day, statuses)
+
+
+def class_statuses(conn, course, year, absent=(), late=(), default=PRESENT):
+    """(student_id, status) for everyone in a course/year section, plus unknown roll numbers
+
+    absent and late hold roll numbers; everyone else gets the default status.
+    Roll numbers that aren't in the section come back sorted as the second item.
+    """
+    absent = set(absent)
+    late = set(late)
+    default = status_code(default)
+
+    statuses = []
+    found = set()
+    cursor = conn.execute('SELECT id, roll_number FROM students WHERE course = ? AND year = ?',
+                          (course, int(year)))
+    for student_id, roll_number in cursor:
+        if roll_number in absent:
+            statuses.append((student_id, ABSENT))
+            found.add(roll_number)
+        elif roll_number in late:
+            statuses.append((student_id, LATE))
+            found.add(roll_number)
+        else:
+            statuses.append((student_id, default))
+    return statuses, sorted((absent | late) - found)
+
+
+def mark_class(conn, day, course, year, absent=(), late=(), default=PRESENT):
+    """Take roll call for a whole course/year section in one transaction
+
+    Returns (students marked, unknown roll numbers). Nothing is written when a
+    roll number isn't in the section, so a typo never marks that student present.
+    """
+    with conn:
+        statuses, unknown = class_statuses(conn, course, year, absent, late, default)
+        if unknown:
+            return 0, unknown
+        return write_marks(conn, day, statuses), unknown
+
+
+def get_totals(conn, student_id):
+    """Return (days_present, days_total) for one student"""
+    row = conn.execute('SELECT days_present, days_total FROM attendance_totals WHERE student_id = ?',
+                       (student_id,)).fetchone()
+    return row or (0, 0)
+
+
+def rebuild_totals(conn):
+    """Recompute every total from the daily records, e.g. after a bulk import"""
+    with conn:
+        conn.execute('DELETE FROM attendance_totals')
+        conn.execute(f'''
+            INSERT INTO attendance_totals (student_id, days_present, days_total)
+            SELECT student_id, SUM(status > {ABSENT}), COUNT(*)
+            FROM attendance_days GROUP BY student_id
+        ''')
@@ -0,0 +1,260 @@
+# Online Backups for the Student Database
+# Author: Ajay Mondal
+# Technologies: Python, SQLite backup API, gzip
+
+import argparse
+import glob
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import student_db
+
+# Pages copied per step; the source is only read-locked for one step at a time
+PAGES_PER_STEP = 256
+STEP_PAUSE = 0.005
+
+# A write from another connection restarts a stepped copy; after this many
+# restarts the copy is done in one step, which in WAL mode still doesn't block writers
+MAX_RESTARTS = 3
+
+# Compressed backups kept per database
+KEEP_BACKUPS = 14
+
+# Default schedule for the app
+BACKUP_INTERVAL_HOURS = 24
+
+BACKUP_PREFIX = 'students-'
+
+logger = logging.getLogger('student_backup')
+
+
+def backup_dir(db_path=student_db.DB_PATH):
+    """Backups live in a 'backups' folder next to the main database"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'backups')
+
+
+def setup_logging(directory):
+    """Log every backup to backup.log in the backup folder"""
+    os.makedirs(directory, exist_ok=True)
+    log_path = os.path.join(directory, 'backup.log')
+    if not any(getattr(handler, 'baseFilename', None) == log_path for handler in logger.handlers):
+        handler = logging.FileHandler(log_path, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+class BackupRestarted(Exception):
+    pass
+
+
+def copy_database(db_path, target_path, pages=PAGES_PER_STEP):
+    """Copy a live database with the online backup API in small steps"""
+    source = sqlite3.connect(db_path, timeout=student_db.BUSY_TIMEOUT)
+    target = sqlite3.connect(target_path)
+    state = {'remaining': None, 'restarts': 0}
+
+    def progress(status, remaining, total):
+        # Remaining pages going back up means the copy started over
+        if state['remaining'] is not None and remaining > state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] >= MAX_RESTARTS:
+                raise BackupRestarted()
+        state['remaining'] = remaining
+        # Pausing between steps lets the app's writers in
+        time.sleep(STEP_PAUSE)
+
+    try:
+        try:
+            source.backup(target, pages=pages, progress=progress)
+        except BackupRestarted:
+            logger.info("busy database, copying %s in one step", db_path)
+            source.backup(target, pages=-1)
+        # A standalone copy doesn't need the WAL
+        target.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        target.close()
+        source.close()
+
+
+def check_integrity(db_path):
+    """Return None if the database is sound, otherwise SQLite's first complaint"""
+    conn = sqlite3.connect(db_path)
+    try:
+        result = conn.execute('PRAGMA integrity_check').fetchone()[0]
+    finally:
+        conn.close()
+    return None if result == 'ok' else result
+
+
+def compress(source_path, target_path):
+    with open(source_path, 'rb') as source, gzip.open(target_path, 'wb', compresslevel=6) as target:
+        shutil.copyfileobj(source, target, 1024 * 1024)
+
+
+def list_backups(directory):
+    """Compressed backups, oldest first"""
+    return sorted(glob.glob(os.path.join(directory, f'{BACKUP_PREFIX}*.db.gz')))
+
+
+def rotate_backups(directory, keep=KEEP_BACKUPS):
+    """Delete all but the newest keep backups; returns the removed paths"""
+    removed = list_backups(directory)[:-keep] if keep > 0 else []
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+def backup_database(db_path=student_db.DB_PATH, directory=None, keep=KEEP_BACKUPS):
+    """Take a verified, compressed backup of a live database and rotate old ones
+
+    Returns a dict with the backup path, sizes and duration.
+    """
+    directory = directory or backup_dir(db_path)
+    os.makedirs(directory, exist_ok=True)
+    started = time.perf_counter()
+
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    final_path = os.path.join(directory, f'{BACKUP_PREFIX}{stamp}.db.gz')
+    fd, copy_path = tempfile.mkstemp(suffix='.db', dir=directory)
+    os.close(fd)
+    try:
+        copy_database(db_path, copy_path)
+        problem = check_integrity(copy_path)
+        if problem:
+            raise RuntimeError(f"Backup failed integrity check: {problem}")
+
+        # Compress under a temporary name so a half-written file is never kept as a backup
+        compress(copy_path, final_path + '.partial')
+        os.replace(final_path + '.partial', final_path)
+        database_size = os.path.getsize(copy_path)
+    finally:
+        for path in (copy_path, final_path + '.partial'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    removed = rotate_backups(directory, keep)
+    result = {
+        'path': final_path,
+        'database_bytes': database_size,
+        'backup_bytes': os.path.getsize(final_path),
+        'seconds': round(time.perf_counter() - started, 3),
+        'removed': removed,
+    }
+    logger.info("backup %s: %.1f MB -> %.1f MB in %.2fs, %d old backups removed",
+                os.path.basename(final_path), result['database_bytes'] / 1e6,
+                result['backup_bytes'] / 1e6, result['seconds'], len(removed))
+    return result
+
+
+def verify_backup(path):
+    """Decompress a backup to a temporary file and run the integrity check on it"""
+    fd, copy_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        with gzip.open(path, 'rb') as source, open(copy_path, 'wb') as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        return check_integrity(copy_path)
+    finally:
+        os.remove(copy_path)
+
+
+class BackupScheduler:
+    """Take backups on a background thread, every interval and on request"""
+
+    def __init__(self, db_path=student_db.DB_PATH, interval_hours=BACKUP_INTERVAL_HOURS,
+                 directory=None, keep=KEEP_BACKUPS):
+        self.db_path = db_path
+        self.interval = interval_hours * 3600
+        self.directory = directory or backup_dir(db_path)
+        self.keep = keep
+        self.last_result = None
+        self.error = None
+        self.running = False
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        setup_logging(self.directory)
+        self.thread.start()
+
+    def backup_now(self):
+        """Ask the thread for a backup without waiting for the schedule"""
+        self.wake.set()
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+
+    def run(self):
+        last_backup = self.latest_backup_time()
+        while not self.stopped.is_set():
+            due_in = max(0, last_backup + self.interval - time.time())
+            requested = self.wake.wait(timeout=due_in)
+            self.wake.clear()
+            if self.stopped.is_set():
+                break
+            if not requested and time.time() < last_backup + self.interval:
+                continue
+
+            self.running = True
+            try:
+                self.last_result = backup_database(self.db_path, self.directory, self.keep)
+                self.error = None
+            except Exception as e:
+                self.error = e
+                logger.exception("backup of %s failed", self.db_path)
+            finally:
+                self.running = False
+                last_backup = time.time()
+
+    def latest_backup_time(self):
+        """Modification time of the newest backup, so restarts keep the schedule"""
+        backups = list_backups(self.directory)
+        return os.path.getmtime(backups[-1]) if backups else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Back up the live student database")
+    parser.add_argument('--db', default=student_db.DB_PATH, help="student database")
+    parser.add_argument('--dest', help="backup folder (default: backups next to the database)")
+    parser.add_argument('--keep', type=int, default=KEEP_BACKUPS, help="backups to keep")
+    parser.add_argument('--every', type=float, metavar='HOURS', help="keep running and back up on this schedule")
+    parser.add_argument('--verify', metavar='BACKUP', help="check a .db.gz backup instead of taking one")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        problem = verify_backup(args.verify)
+        print(f"❌ {problem}" if problem else f"✅ {args.verify} is intact")
+        return
+
+    directory = args.dest or backup_dir(args.db)
+    setup_logging(directory)
+    logger.addHandler(logging.StreamHandler())
+
+    if args.every:
+        scheduler = BackupScheduler(args.db, args.every, directory, args.keep)
+        scheduler.start()
+        try:
+            scheduler.thread.join()
+        except KeyboardInterrupt:
+            scheduler.stop()
+    else:
+        backup_database(args.db, directory, args.keep)
+
+
+if __name__ == '__main__':
+    main()
+
+# To back up while the app is running:
+# 1. Run: python student_backup.py            (one backup now)
+# 2. Or:  python student_backup.py --every 6  (every six hours)
+# 3. Check a backup: python student_backup.py --verify backups/students-20261019-020000.db.gz
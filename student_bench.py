@@ -0,0 +1,227 @@
+# Data-Layer Benchmark for the Student Management System
+# Author: Ajay Mondal
+# Technologies: Python, SQLite
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import student_attendance
+import student_db
+import student_export
+import tracing
+from student_repository import StudentRepository
+
+DEFAULT_SCALES = [10000, 100000]
+
+COURSES = ['BCA', 'MCA', 'B.Tech', 'M.Tech', 'BSc CS']
+FIRST_NAMES = ['Ajay', 'Rahul', 'Priya', 'Sneha', 'Amit', 'Rohan', 'Kavya', 'Arjun',
+               'Ananya', 'Vikram', 'Pooja', 'Sourav', 'Riya', 'Karan', 'Neha', 'Aditya']
+LAST_NAMES = ['Mondal', 'Das', 'Sharma', 'Ghosh', 'Roy', 'Sen', 'Gupta', 'Banerjee',
+              'Chatterjee', 'Paul', 'Singh', 'Khan', 'Bose', 'Dutta', 'Saha', 'Mukherjee']
+
+
+def seed_students(conn, count, attendance_days=0, seed=42, batch_size=10000):
+    """Insert realistic synthetic students (and optional daily attendance)"""
+    rng = random.Random(seed)
+    start_id = conn.execute('SELECT IFNULL(MAX(id), 0) FROM students').fetchone()[0]
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    for batch_start in range(0, count, batch_size):
+        rows = []
+        for n in range(batch_start, min(count, batch_start + batch_size)):
+            number = start_id + n + 1
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            rows.append((
+                f'{first} {last}',
+                f'R{number:08d}',
+                f'{first.lower()}.{last.lower()}{number}@example.com',
+                f'9{rng.randint(100000000, 999999999)}',
+                rng.choice(COURSES),
+                rng.randint(1, 4),
+                round(min(100, max(0, rng.gauss(78, 12))), 1),
+                round(min(10, max(0, rng.gauss(6.8, 1.5))), 2),
+                current_time,
+                current_time,
+            ))
+        with conn:
+            conn.executemany('''
+                INSERT INTO students (name, roll_number, email, phone, course, year,
+                                      attendance, grade, created_date, updated_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+    if attendance_days:
+        ids = [row[0] for row in conn.execute('SELECT id FROM students WHERE id > ?', (start_id,))]
+        first_day = date.today() - timedelta(days=attendance_days)
+        for offset in range(attendance_days):
+            day = first_day + timedelta(days=offset)
+            statuses = [(student_id, student_attendance.PRESENT if rng.random() < 0.8
+                         else student_attendance.ABSENT) for student_id in ids]
+            student_attendance.mark_attendance(conn, day, statuses)
+
+
+def percentiles(samples):
+    """Return p50/p95/p99/max of a list of millisecond timings"""
+    ordered = sorted(samples)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        'count': len(ordered),
+        'p50_ms': round(rank(50), 3),
+        'p95_ms': round(rank(95), 3),
+        'p99_ms': round(rank(99), 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+def time_operation(func, repeat):
+    """Run func repeat times and return the timings in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_scale(workdir, count, attendance_days, repeat, cached=False):
+    """Seed a fresh database with count students and time every data path
+
+    Reads go to SQLite every time unless cached is set, in which case
+    repeated reads are mostly repository cache hits.
+    """
+    db_path = os.path.join(workdir, f'students_{count}.db')
+    repository = StudentRepository(db_path, cache=cached)
+    conn = repository.connection()
+
+    started = time.perf_counter()
+    seed_students(conn, count, attendance_days)
+    seed_seconds = time.perf_counter() - started
+
+    rng = random.Random(7)
+    ids = [row[0] for row in conn.execute('SELECT id FROM students')]
+    new_ids = []
+
+    def add():
+        number = len(new_ids)
+        new_ids.append(repository.add_student({
+            'name': f'Bench Student {number}', 'roll_number': f'BENCH{number:08d}',
+            'course': 'BCA', 'year': 2, 'attendance': 80, 'grade': 7,
+        }))
+
+    def update():
+        repository.update_student(rng.choice(ids), {'attendance': rng.randint(50, 100)})
+
+    def delete():
+        repository.delete_student(new_ids.pop())
+
+    def export():
+        student_export.export_students(os.path.join(workdir, 'export.csv'), db_path)
+
+    operations = {
+        'load_students_full': (lambda: repository.search(limit=None), max(1, repeat // 20)),
+        'load_students_page': (lambda: repository.search(limit=student_db.PAGE_SIZE), repeat),
+        'search_prefix': (lambda: repository.search(rng.choice(FIRST_NAMES)[:3]), repeat),
+        'search_filtered': (lambda: repository.search('', rng.choice(COURSES), rng.randint(1, 4)), repeat),
+        'on_select': (lambda: repository.get_student(rng.choice(ids)), repeat),
+        'generate_report': (repository.report, repeat),
+        'update_analytics': (repository.analytics, repeat),
+        'add_student': (add, repeat),
+        'update_student': (update, repeat),
+        'delete_student': (delete, repeat),
+        'export_csv': (export, max(1, repeat // 20)),
+    }
+
+    results = {}
+    for name, (func, runs) in operations.items():
+        results[name] = percentiles(time_operation(func, runs))
+        print(f"  {name:<20} p50 {results[name]['p50_ms']:>10.3f} ms   "
+              f"p99 {results[name]['p99_ms']:>10.3f} ms")
+
+    repository.pool.close()
+    return {
+        'students': count,
+        'attendance_days': attendance_days,
+        'cached': cached,
+        'seed_seconds': round(seed_seconds, 2),
+        'db_size_mb': round(os.path.getsize(db_path) / (1024 * 1024), 1),
+        'peak_rss_mb': tracing.peak_rss_mb(),
+        'operations': results,
+    }
+
+
+def seed_main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill a student database with synthetic students")
+    parser.add_argument('count', type=int, help="students to add")
+    parser.add_argument('--db', default=student_db.DB_PATH, help="student database")
+    parser.add_argument('--attendance-days', type=int, default=0,
+                        help="days of roll call to seed per student")
+    parser.add_argument('--seed', type=int, default=42, help="random seed, for repeatable data")
+    args = parser.parse_args(argv)
+
+    conn = student_db.connect(args.db)
+    try:
+        started = time.perf_counter()
+        seed_students(conn, args.count, args.attendance_days, args.seed)
+    finally:
+        conn.close()
+    print(f"✅ {args.count:,} students added to {args.db} in {time.perf_counter() - started:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the student data layer at several scales")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="student counts to benchmark, e.g. 10000 100000 1000000")
+    parser.add_argument('--attendance-days', type=int, default=5,
+                        help="days of roll call to seed per student")
+    parser.add_argument('--repeat', type=int, default=200, help="timed runs per operation")
+    parser.add_argument('--output', default='bench_results.json', help="where to write JSON results")
+    parser.add_argument('--workdir', help="directory for the seeded databases (default: temporary)")
+    parser.add_argument('--cached', action='store_true',
+                        help="leave the repository cache on (times cache hits instead of SQLite)")
+    args = parser.parse_args(argv)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'sqlite_version': sqlite3.sqlite_version,
+        'python': sys.version.split()[0],
+        'scales': [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        for count in args.scales:
+            print(f"📊 {count:,} students")
+            report['scales'].append(benchmark_scale(workdir, count, args.attendance_days, args.repeat,
+                                                    args.cached))
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
+
+# To run the benchmark:
+# 1. Run: python student_bench.py --scales 10000 100000 1000000
+# 2. Compare bench_results.json between commits
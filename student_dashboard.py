@@ -0,0 +1,251 @@
+# Analytics Dashboard for the Student Management System
+# Author: Ajay Mondal
+# Technologies: Python, Tkinter, Matplotlib, NumPy
+
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+import student_db
+import tracing
+
+# Coalesce change notifications into at most one redraw per interval
+REFRESH_INTERVAL_MS = 500
+
+# Fixed histogram edges so bars can be reused between refreshes
+ATTENDANCE_EDGES = np.array(student_db.histogram_edges('attendance'), dtype=float)
+GRADE_EDGES = np.array(student_db.histogram_edges('grade'), dtype=float)
+
+
+class AnalyticsDashboard:
+    """2x2 chart grid that updates its artists in place and blits changes"""
+
+    def __init__(self, parent, repository, root, debug=None):
+        self.repository = repository
+        self.root = root
+        self.debug = os.environ.get('STUDENT_DASHBOARD_DEBUG') == '1' if debug is None else debug
+
+        # Create matplotlib figure
+        self.fig, ((self.ax1, self.ax2), (self.ax3, self.ax4)) = plt.subplots(2, 2, figsize=(10, 6))
+        self.fig.patch.set_facecolor('#f0f0f0')
+
+        # Canvas for matplotlib
+        self.canvas = FigureCanvasTkAgg(self.fig, parent)
+        self.widget = self.canvas.get_tk_widget()
+        self.widget.pack(fill='both', expand=True)
+
+        self.refresh_job = None
+        self.dirty = False
+        self.background = None
+        self.pie_artists = []
+        self.course_data = None
+        self.year_values = None
+
+        self.create_charts()
+
+        # Cohort analytics scan the whole table, so they run on a worker thread
+        self.cohort_requests = queue.Queue()
+        self.cohort_generation = 0
+        self.cohort_result = None
+        self.cohort_poll_job = None
+        threading.Thread(target=self.cohort_worker, daemon=True).start()
+
+        # Re-capture the blit background after every full draw
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.widget.bind('<Map>', lambda event: self.dirty and self.schedule_refresh())
+
+    def create_charts(self):
+        """Set up titles, labels and reusable bar artists once"""
+        self.ax1.set_title('Course Distribution')
+
+        self.attendance_bars = self.create_histogram(
+            self.ax2, ATTENDANCE_EDGES, 'skyblue', 'Attendance Distribution', 'Attendance %')
+        self.grade_bars = self.create_histogram(
+            self.ax3, GRADE_EDGES, 'lightgreen', 'Grade Distribution', 'Grade (0-10)')
+
+        self.ax4.set_title('Year-wise Distribution')
+        self.ax4.set_xlabel('Year')
+        self.ax4.set_ylabel('Number of Students')
+        self.year_bars = None
+
+        self.overlay = self.fig.text(0.01, 0.01, '', fontsize=8, color='#7f8c8d',
+                                     animated=True, visible=self.debug)
+        self.cohort_text = self.fig.text(0.99, 0.01, '', fontsize=8, color='#c0392b',
+                                         ha='right', animated=True)
+
+        self.fig.tight_layout()
+
+    def create_histogram(self, ax, edges, color, title, xlabel):
+        """Create zero-height histogram bars over fixed bin edges"""
+        bars = ax.bar(edges[:-1], np.zeros(len(edges) - 1), width=np.diff(edges), align='edge',
+                      color=color, edgecolor='black', animated=True)
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel('Number of Students')
+        ax.set_xlim(edges[0], edges[-1])
+        ax.set_ylim(0, 1)
+        return bars
+
+    def schedule_refresh(self):
+        """Request a redraw; repeated requests within the interval are merged"""
+        self.dirty = True
+        if self.refresh_job is None:
+            self.refresh_job = self.root.after(REFRESH_INTERVAL_MS, self.refresh)
+
+    @tracing.traced()
+    def refresh(self):
+        """Query the latest numbers and redraw what changed"""
+        self.refresh_job = None
+
+        # Hidden dashboards wait until they are shown again
+        if not self.widget.winfo_viewable():
+            return
+
+        started = time.perf_counter()
+        self.dirty = False
+        layout_changed = False
+
+        # Cached by the repository until the data changes
+        analytics = self.repository.analytics()
+        layout_changed |= self.update_pie(analytics['courses'])
+        layout_changed |= self.update_histogram(self.ax2, self.attendance_bars,
+                                                analytics['attendance_histogram'])
+        layout_changed |= self.update_histogram(self.ax3, self.grade_bars,
+                                                analytics['grade_histogram'])
+        layout_changed |= self.update_years(analytics['years'])
+
+        if layout_changed or self.background is None:
+            # Axis limits or categories changed, so the static parts need a full draw
+            self.canvas.draw()
+            mode = 'full'
+        else:
+            self.blit()
+            mode = 'blit'
+
+        self.show_timing(mode, (time.perf_counter() - started) * 1000)
+        self.request_cohort_stats()
+
+    def request_cohort_stats(self):
+        """Ask the worker for fresh cohort analytics and watch for the answer"""
+        self.cohort_generation += 1
+        self.cohort_requests.put(self.cohort_generation)
+        if self.cohort_poll_job is None:
+            self.cohort_poll_job = self.root.after(200, self.poll_cohort_stats)
+
+    def cohort_worker(self):
+        """Compute cohort analytics off the Tk thread, merging queued requests"""
+        while True:
+            generation = self.cohort_requests.get()
+            while not self.cohort_requests.empty():
+                generation = self.cohort_requests.get_nowait()
+            try:
+                with tracing.span('cohort_analytics'):
+                    self.cohort_result = (generation, self.repository.cohort_analytics())
+            except Exception as e:
+                self.cohort_result = (generation, None)
+                print(f"Cohort analytics error: {str(e)}")
+
+    def poll_cohort_stats(self):
+        """Show the latest cohort numbers once the worker has produced them"""
+        self.cohort_poll_job = None
+        generation, result = self.cohort_result or (0, None)
+
+        # Keep waiting until the answer to the latest request arrives
+        if generation != self.cohort_generation:
+            self.cohort_poll_job = self.root.after(200, self.poll_cohort_stats)
+        if result is None:
+            return
+
+        self.cohort_text.set_text(f"At risk: {len(result['at_risk_ids']):,}   "
+                                  f"grade-attendance r = {result['correlation']:.2f}")
+        if self.background is not None:
+            self.blit()
+
+    def update_pie(self, course_data):
+        """Rebuild the course pie only when the counts changed"""
+        if course_data == self.course_data:
+            return False
+        first_draw = self.course_data is None
+        self.course_data = course_data
+
+        for artist in self.pie_artists:
+            artist.remove()
+        self.pie_artists = []
+
+        if course_data:
+            courses, counts = zip(*course_data)
+            wedges, texts, autotexts = self.ax1.pie(counts, labels=[str(course) for course in courses],
+                                                    autopct='%1.1f%%')
+            self.pie_artists = list(wedges) + list(texts) + list(autotexts)
+            for artist in self.pie_artists:
+                artist.set_animated(True)
+
+        # The first pie switches the axes to an equal-aspect frameless layout
+        return first_draw
+
+    def update_histogram(self, ax, bars, counts):
+        """Set bar heights from precomputed bucket counts; report whether the y-axis had to change"""
+        for bar, count in zip(bars, counts):
+            bar.set_height(count)
+        return self.fit_ylim(ax, max(counts, default=0))
+
+    def update_years(self, year_data):
+        """Update year bars in place, rebuilding them only when the years change"""
+        years = [year for year, count in year_data]
+        counts = [count for year, count in year_data]
+
+        if years != self.year_values:
+            if self.year_bars is not None:
+                self.year_bars.remove()
+            positions = range(len(years))
+            self.year_bars = self.ax4.bar(positions, counts, color='orange', animated=True)
+            self.ax4.set_xticks(positions)
+            self.ax4.set_xticklabels([str(year) for year in years])
+            self.year_values = years
+            self.fit_ylim(self.ax4, max(counts, default=0))
+            return True
+
+        for bar, count in zip(self.year_bars, counts):
+            bar.set_height(count)
+        return self.fit_ylim(self.ax4, max(counts, default=0))
+
+    def fit_ylim(self, ax, peak):
+        """Grow or shrink the y-axis with headroom so small changes don't move it"""
+        top = ax.get_ylim()[1]
+        if peak <= top and (peak * 4 > top or top <= 1):
+            return False
+        ax.set_ylim(0, max(1, peak * 1.5))
+        return True
+
+    def animated_artists(self):
+        artists = self.pie_artists + list(self.attendance_bars) + list(self.grade_bars)
+        if self.year_bars is not None:
+            artists += list(self.year_bars)
+        return artists + [self.overlay, self.cohort_text]
+
+    def on_draw(self, event):
+        """Cache the static figure and paint the animated artists over it"""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_animated()
+
+    def draw_animated(self):
+        for artist in self.animated_artists():
+            self.fig.draw_artist(artist)
+
+    def blit(self):
+        """Repaint only the animated artists over the cached background"""
+        self.canvas.restore_region(self.background)
+        self.draw_animated()
+        self.canvas.blit(self.fig.bbox)
+
+    def show_timing(self, mode, elapsed_ms):
+        """Write the last redraw time into the debug overlay"""
+        if not self.debug:
+            return
+        self.overlay.set_text(f'redraw {elapsed_ms:.1f} ms ({mode})')
+        self.blit()
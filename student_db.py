@@ -0,0 +1,434 @@
+# Student Records Database Layer
+# Author: Ajay Mondal
+# Technologies: Python, SQLite (FTS5)
+
+import json
+import re
+import sqlite3
+
+import student_attendance
+
+DB_PATH = 'student_records.db'
+
+# Number of rows shown per search page
+PAGE_SIZE = 200
+
+LIST_COLUMNS = 's.id, s.name, s.roll_number, s.course, s.year, s.attendance, s.grade'
+
+# Every students column, in table order
+STUDENT_COLUMNS = ['id', 'name', 'roll_number', 'email', 'phone', 'course', 'year',
+                   'attendance', 'grade', 'created_date', 'updated_date']
+RECORD_COLUMNS = ', '.join(f's.{column}' for column in STUDENT_COLUMNS)
+
+
+# Seconds a connection waits on another writer's lock before giving up
+BUSY_TIMEOUT = 5.0
+
+
+def open_connection(path=DB_PATH, timeout=BUSY_TIMEOUT, check_same_thread=True):
+    """Open a connection in WAL mode so readers never block on the writer"""
+    conn = sqlite3.connect(path, timeout=timeout, check_same_thread=check_same_thread)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def connect(path=DB_PATH):
+    """Open the student database and make sure the schema exists"""
+    conn = open_connection(path)
+    init_schema(conn)
+    return conn
+
+
+def init_schema(conn):
+    """Create student tables, filter indexes, search index and summaries"""
+    cursor = conn.cursor()
+
+    # Create students table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            roll_number TEXT UNIQUE NOT NULL,
+            email TEXT,
+            phone TEXT,
+            course TEXT,
+            year INTEGER,
+            attendance REAL DEFAULT 0,
+            grade REAL DEFAULT 0,
+            created_date TEXT,
+            updated_date TEXT
+        )
+    ''')
+
+    # Indexes for the course/year filters and "changed since" queries
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_students_course_year ON students (course, year)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_students_year ON students (year)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_students_updated ON students (updated_date)')
+
+    init_search_index(cursor)
+    init_summary_tables(cursor)
+    student_attendance.init_attendance_tables(cursor)
+    init_change_log(cursor)
+
+    conn.commit()
+
+
+def init_search_index(cursor):
+    """Create the FTS5 index over name, roll number and email"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='students_fts'")
+    exists = cursor.fetchone() is not None
+
+    # External content table: the text lives in students, FTS5 keeps only the index
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+            name, roll_number, email,
+            content='students', content_rowid='id',
+            prefix='2 3'
+        )
+    ''')
+
+    # Keep the index in sync with students
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_insert AFTER INSERT ON students BEGIN
+            INSERT INTO students_fts (rowid, name, roll_number, email)
+            VALUES (new.id, new.name, new.roll_number, new.email);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_delete AFTER DELETE ON students BEGIN
+            INSERT INTO students_fts (students_fts, rowid, name, roll_number, email)
+            VALUES ('delete', old.id, old.name, old.roll_number, old.email);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_update
+        AFTER UPDATE OF name, roll_number, email ON students BEGIN
+            INSERT INTO students_fts (students_fts, rowid, name, roll_number, email)
+            VALUES ('delete', old.id, old.name, old.roll_number, old.email);
+            INSERT INTO students_fts (rowid, name, roll_number, email)
+            VALUES (new.id, new.name, new.roll_number, new.email);
+        END
+    ''')
+
+    # Index rows that were added before search existed
+    if not exists:
+        cursor.execute("INSERT INTO students_fts (students_fts) VALUES ('rebuild')")
+
+
+def init_change_log(cursor):
+    """Record every insert, update and delete on students with a monotonic sequence number
+
+    Students moved to an archive file are logged with op 'A' instead of 'D'.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='student_changes'")
+    exists = cursor.fetchone() is not None
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS student_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+    ''')
+
+    for event, op, row in [('INSERT', 'I', 'new'), ('UPDATE', 'U', 'new'), ('DELETE', 'D', 'old')]:
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS student_changes_{event.lower()} AFTER {event} ON students BEGIN
+                INSERT INTO student_changes (student_id, op) VALUES ({row}.id, '{op}');
+            END
+        ''')
+
+    # Students added before the log existed count as inserts, so the first sync is a full one
+    if not exists:
+        cursor.execute("INSERT INTO student_changes (student_id, op) SELECT id, 'I' FROM students ORDER BY id")
+
+
+def get_change_checkpoint(conn):
+    """Sequence number of the latest recorded change"""
+    return conn.execute('SELECT IFNULL(MAX(seq), 0) FROM student_changes').fetchone()[0]
+
+
+def get_data_version(conn):
+    """Counter that grows with every committed change to students, the same for every connection
+
+    Read from the change log's AUTOINCREMENT sequence, so pruning the log
+    never makes it go backwards.
+    """
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'student_changes'").fetchone()
+    return row[0] if row else 0
+
+
+def changes_query():
+    """Latest change per student in (since, upto]; deleted and archived students keep only their id"""
+    columns = ', '.join('c.student_id AS id' if column == 'id' else f's.{column}'
+                        for column in STUDENT_COLUMNS)
+    return f'''
+        SELECT c.seq AS change_seq, c.op AS change_op, c.changed_at, {columns}
+        FROM (
+            SELECT MAX(seq) AS seq FROM student_changes WHERE seq > ? AND seq <= ? GROUP BY student_id
+        ) latest
+        JOIN student_changes c ON c.seq = latest.seq
+        LEFT JOIN students s ON s.id = c.student_id AND c.op NOT IN ('D', 'A')
+        ORDER BY c.seq
+    '''
+
+
+def prune_changes(conn, upto_seq):
+    """Forget changes every consumer has already synced"""
+    with conn:
+        conn.execute('DELETE FROM student_changes WHERE seq <= ?', (upto_seq,))
+
+
+# Histogram buckets kept by the summary triggers: metric -> (column, bucket width)
+HISTOGRAMS = {
+    'attendance': ('attendance', 10),
+    'grade': ('grade', 1),
+}
+HISTOGRAM_BUCKETS = 10
+
+
+def summary_trigger_body(row, sign):
+    """SQL that adds (sign=1) or removes (sign=-1) one student row from the summaries"""
+    statements = [f'''
+        INSERT INTO student_stats (course, year)
+        SELECT {row}.course, {row}.year
+        WHERE NOT EXISTS (
+            SELECT 1 FROM student_stats WHERE course IS {row}.course AND year IS {row}.year
+        );''', f'''
+        UPDATE student_stats SET
+            student_count = student_count + {sign},
+            attendance_sum = attendance_sum + {sign} * {numeric_or_zero(row + '.attendance')},
+            attendance_count = attendance_count + {sign} * ({is_positive(row + '.attendance')}),
+            grade_sum = grade_sum + {sign} * {numeric_or_zero(row + '.grade')},
+            grade_count = grade_count + {sign} * ({is_positive(row + '.grade')})
+        WHERE course IS {row}.course AND year IS {row}.year;''', f'''
+        DELETE FROM student_stats
+        WHERE student_count = 0 AND course IS {row}.course AND year IS {row}.year;''']
+
+    for metric, (column, width) in HISTOGRAMS.items():
+        value = f'{row}.{column}'
+        statements.append(f'''
+        INSERT INTO student_histogram (metric, bucket, count)
+        SELECT '{metric}', {bucket_expression(value, width)}, {sign}
+        WHERE {is_positive(value)}
+        ON CONFLICT (metric, bucket) DO UPDATE SET count = count + {sign};''')
+
+    return ''.join(statements)
+
+
+def is_positive(value):
+    """SQL test for a numeric value above zero (blank form fields are stored as text)"""
+    return f"typeof({value}) IN ('integer', 'real') AND {value} > 0"
+
+
+def numeric_or_zero(value):
+    """SQL expression for a value that only counts when it is positive"""
+    return f'(CASE WHEN {is_positive(value)} THEN {value} ELSE 0 END)'
+
+
+def bucket_expression(value, width):
+    """SQL expression for the histogram bucket a value falls into"""
+    return f'MIN(MAX(CAST({value} / {width} AS INTEGER), 0), {HISTOGRAM_BUCKETS - 1})'
+
+
+def init_summary_tables(cursor):
+    """Create running aggregates that triggers keep up to date"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='student_stats'")
+    exists = cursor.fetchone() is not None
+
+    # Count, sums and non-zero counts per course and year
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS student_stats (
+            course TEXT,
+            year INTEGER,
+            student_count INTEGER NOT NULL DEFAULT 0,
+            attendance_sum REAL NOT NULL DEFAULT 0,
+            attendance_count INTEGER NOT NULL DEFAULT 0,
+            grade_sum REAL NOT NULL DEFAULT 0,
+            grade_count INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_student_stats_group ON student_stats (course, year)')
+
+    # Bucket counts for the attendance and grade histograms
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS student_histogram (
+            metric TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, bucket)
+        )
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS student_stats_insert AFTER INSERT ON students BEGIN
+            {summary_trigger_body('new', 1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS student_stats_delete AFTER DELETE ON students BEGIN
+            {summary_trigger_body('old', -1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS student_stats_update
+        AFTER UPDATE OF course, year, attendance, grade ON students BEGIN
+            {summary_trigger_body('old', -1)}
+            {summary_trigger_body('new', 1)}
+        END
+    ''')
+
+    # Summarise rows that were added before the summary tables existed
+    if not exists:
+        rebuild_summary_tables(cursor)
+
+
+def rebuild_summary_tables(cursor):
+    """Recompute the summary tables from scratch with full scans"""
+    cursor.execute('DELETE FROM student_stats')
+    cursor.execute(f'''
+        INSERT INTO student_stats (course, year, student_count, attendance_sum,
+                                   attendance_count, grade_sum, grade_count)
+        SELECT course, year, COUNT(*),
+               SUM({numeric_or_zero('attendance')}), SUM({is_positive('attendance')}),
+               SUM({numeric_or_zero('grade')}), SUM({is_positive('grade')})
+        FROM students GROUP BY course, year
+    ''')
+
+    cursor.execute('DELETE FROM student_histogram')
+    for metric, (column, width) in HISTOGRAMS.items():
+        cursor.execute(f'''
+            INSERT INTO student_histogram (metric, bucket, count)
+            SELECT ?, {bucket_expression(column, width)} AS bucket, COUNT(*)
+            FROM students WHERE {is_positive(column)} GROUP BY bucket
+        ''', (metric,))
+
+
+def get_summary(conn):
+    """Return total students and average non-zero attendance and grade"""
+    total, attendance_sum, attendance_count, grade_sum, grade_count = conn.execute('''
+        SELECT IFNULL(SUM(student_count), 0),
+               IFNULL(SUM(attendance_sum), 0), IFNULL(SUM(attendance_count), 0),
+               IFNULL(SUM(grade_sum), 0), IFNULL(SUM(grade_count), 0)
+        FROM student_stats
+    ''').fetchone()
+    return {
+        'total_students': total,
+        'avg_attendance': attendance_sum / attendance_count if attendance_count else 0,
+        'avg_grade': grade_sum / grade_count if grade_count else 0,
+    }
+
+
+def get_course_counts(conn):
+    """Return (course, student count) pairs from the summary table"""
+    return conn.execute('''
+        SELECT course, SUM(student_count) FROM student_stats
+        GROUP BY course ORDER BY course
+    ''').fetchall()
+
+
+def get_year_counts(conn):
+    """Return (year, student count) pairs from the summary table"""
+    return conn.execute('''
+        SELECT year, SUM(student_count) FROM student_stats
+        GROUP BY year ORDER BY year
+    ''').fetchall()
+
+
+def get_histogram(conn, metric):
+    """Return dense bucket counts for a maintained histogram"""
+    counts = [0] * HISTOGRAM_BUCKETS
+    for bucket, count in conn.execute('''
+        SELECT bucket, count FROM student_histogram WHERE metric = ?
+    ''', (metric,)):
+        counts[bucket] = count
+    return counts
+
+
+def bin_column(conn, column, width, where='', params=()):
+    """Bin a numeric column in SQL, for filtered histograms the triggers don't maintain"""
+    counts = [0] * HISTOGRAM_BUCKETS
+    condition = is_positive(column) + (f' AND ({where})' if where else '')
+    for bucket, count in conn.execute(f'''
+        SELECT {bucket_expression(column, width)} AS bucket, COUNT(*)
+        FROM students WHERE {condition} GROUP BY bucket
+    ''', params):
+        counts[bucket] = count
+    return counts
+
+
+def histogram_edges(metric):
+    """Return the bucket edges of a maintained histogram"""
+    width = HISTOGRAMS[metric][1]
+    return [bucket * width for bucket in range(HISTOGRAM_BUCKETS + 1)]
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 prefix query, e.g. 'aj mon' -> '"aj"* "mon"*'"""
+    tokens = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_query(text='', course=None, year=None, columns=LIST_COLUMNS, schema='main'):
+    """Unordered SELECT over one database's students for the search text and filters"""
+    match = build_match_query(text)
+
+    conditions = []
+    params = []
+    if match:
+        conditions.append('f.students_fts MATCH ?')
+        params.append(match)
+    if course:
+        conditions.append('s.course = ?')
+        params.append(course)
+    if year:
+        conditions.append('s.year = ?')
+        params.append(int(year))
+
+    if match:
+        query = f'''
+            SELECT {columns}
+            FROM {schema}.students_fts f JOIN {schema}.students s ON s.id = f.rowid
+            WHERE {' AND '.join(conditions)}
+        '''
+    else:
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        query = f'SELECT {columns} FROM {schema}.students s {where}'
+    return query, params
+
+
+def search_students(conn, text='', course=None, year=None, limit=PAGE_SIZE, offset=0,
+                    columns=LIST_COLUMNS):
+    """Return one page of students matching the search text and filters"""
+    query, params = search_query(text, course, year, columns)
+    # FTS5 yields rowids in order, so LIMIT stops after the first page
+    query += ' ORDER BY f.rowid' if build_match_query(text) else ' ORDER BY s.id'
+
+    if limit is not None:
+        query += ' LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+
+    return conn.execute(query, params).fetchall()
+
+
+def filter_condition(text='', course=None, year=None, ids=None):
+    """WHERE clause over students for a list of ids and/or the search filters"""
+    conditions = []
+    params = []
+    if ids is not None:
+        # One JSON parameter instead of thousands of placeholders
+        conditions.append('id IN (SELECT value FROM json_each(?))')
+        params.append(json.dumps([int(student_id) for student_id in ids]))
+    match = build_match_query(text)
+    if match:
+        conditions.append('id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)')
+        params.append(match)
+    if course:
+        conditions.append('course = ?')
+        params.append(course)
+    if year:
+        conditions.append('year = ?')
+        params.append(int(year))
+    return ' AND '.join(conditions) or '1', params
@@ -0,0 +1,281 @@
+# Streaming Export for Student Records
+# Author: Ajay Mondal
+# Technologies: Python, SQLite, openpyxl, PyArrow
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import threading
+
+import student_db
+import tracing
+
+# Rows fetched from SQLite and written out per step
+CHUNK_SIZE = 5000
+
+# Column types used for Parquet output, anything else is stored as text
+NUMERIC_COLUMNS = {
+    'change_seq': 'int',
+    'id': 'int',
+    'year': 'int',
+    'attendance': 'float',
+    'grade': 'float',
+}
+
+
+def iter_chunks(cursor, chunk_size=CHUNK_SIZE):
+    """Yield rows from an executed cursor in fixed-size chunks"""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+class CsvWriter:
+    """Write rows to a CSV file as they arrive"""
+
+    def __init__(self, filename, columns):
+        self.file = open(filename, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxWriter:
+    """Write rows to an Excel workbook in openpyxl's write-only mode"""
+
+    def __init__(self, filename, columns):
+        from openpyxl import Workbook
+
+        self.filename = filename
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet('Students')
+        self.sheet.append(columns)
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.sheet.append(row)
+
+    def close(self):
+        self.workbook.save(self.filename)
+
+
+class NdjsonWriter:
+    """Write one JSON object per line"""
+
+    def __init__(self, filename, columns):
+        self.file = open(filename, 'w', encoding='utf-8')
+        self.columns = columns
+
+    def write_rows(self, rows):
+        self.file.writelines(json.dumps(dict(zip(self.columns, row))) + '\n' for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Write each chunk as its own Parquet row group"""
+
+    def __init__(self, filename, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.columns = columns
+        self.kinds = [NUMERIC_COLUMNS.get(column, 'text') for column in columns]
+        types = {'int': pa.int64(), 'float': pa.float64(), 'text': pa.string()}
+        self.schema = pa.schema([(column, types[kind]) for column, kind in zip(columns, self.kinds)])
+        self.writer = pq.ParquetWriter(filename, self.schema)
+
+    def write_rows(self, rows):
+        arrays = []
+        for index, kind in enumerate(self.kinds):
+            values = [coerce(row[index], kind) for row in rows]
+            arrays.append(self.pa.array(values, type=self.schema.field(index).type))
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def coerce(value, kind):
+    """Convert a loosely typed SQLite value to the Parquet column type"""
+    if value is None or value == '':
+        return None
+    try:
+        if kind == 'int':
+            return int(value)
+        if kind == 'float':
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+WRITERS = {
+    '.csv': CsvWriter,
+    '.xlsx': XlsxWriter,
+    '.ndjson': NdjsonWriter,
+    '.jsonl': NdjsonWriter,
+    '.parquet': ParquetWriter,
+}
+
+
+def get_writer_class(filename):
+    """Pick the output writer from the file extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Unsupported export format: {extension or filename}")
+    return WRITERS[extension]
+
+
+def export_query(conn, query, filename, params=(), progress=None, chunk_size=CHUNK_SIZE):
+    """Stream the result of a query into a CSV, XLSX, NDJSON or Parquet file"""
+    writer_class = get_writer_class(filename)
+    cursor = conn.execute(query, params)
+    columns = [description[0] for description in cursor.description]
+
+    writer = writer_class(filename, columns)
+    rows_written = 0
+    try:
+        for rows in iter_chunks(cursor, chunk_size):
+            writer.write_rows(rows)
+            rows_written += len(rows)
+            if progress:
+                progress(rows_written)
+    finally:
+        writer.close()
+
+    return rows_written
+
+
+@tracing.traced()
+def export_students(filename, db_path=student_db.DB_PATH, progress=None, chunk_size=CHUNK_SIZE):
+    """Export the students table using its own connection"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return export_query(conn, 'SELECT * FROM students ORDER BY id', filename,
+                            progress=progress, chunk_size=chunk_size)
+    finally:
+        conn.close()
+
+
+def read_checkpoint(path):
+    """Last change sequence number synced, 0 if there is no checkpoint yet"""
+    try:
+        with open(path) as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, seq):
+    # Replace atomically so a crash never leaves a half-written checkpoint
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        f.write(f'{seq}\n')
+    os.replace(temp_path, path)
+
+
+def export_changes(filename, since=0, db_path=student_db.DB_PATH, progress=None, chunk_size=CHUNK_SIZE):
+    """Export the latest state of every student changed after a checkpoint.
+
+    Returns (rows written, new checkpoint). Deleted students are written with
+    change_op 'D' and only their id; students moved to an archive with 'A'.
+    """
+    conn = student_db.connect(db_path)
+    try:
+        # One read transaction, so the checkpoint matches exactly what was exported
+        conn.execute('BEGIN')
+        upto = student_db.get_change_checkpoint(conn)
+        rows_written = export_query(conn, student_db.changes_query(), filename, (since, upto),
+                                    progress=progress, chunk_size=chunk_size)
+        conn.rollback()
+        return rows_written, max(since, upto)
+    finally:
+        conn.close()
+
+
+class ExportJob:
+    """Run an export on a background thread and expose its progress"""
+
+    def __init__(self, filename, db_path=student_db.DB_PATH):
+        self.filename = filename
+        self.db_path = db_path
+        self.rows_written = 0
+        self.total = 0
+        self.error = None
+        self.done = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        # Row count comes from the summary table, so it is cheap to read up front
+        conn = student_db.connect(self.db_path)
+        try:
+            self.total = student_db.get_summary(conn)['total_students']
+        finally:
+            conn.close()
+        self.thread.start()
+
+    def run(self):
+        try:
+            export_students(self.filename, self.db_path, progress=self.set_progress)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def set_progress(self, rows_written):
+        self.rows_written = rows_written
+
+    @property
+    def percent(self):
+        if not self.total:
+            return 100 if self.done else 0
+        return min(100, self.rows_written * 100 / self.total)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export student records or the changes since the last sync")
+    parser.add_argument('output', help="output file (.csv, .xlsx, .ndjson, .jsonl or .parquet)")
+    parser.add_argument('--db', default=student_db.DB_PATH, help="student database")
+    parser.add_argument('--changes', action='store_true', help="only export changes since the checkpoint")
+    parser.add_argument('--checkpoint', default='students.checkpoint',
+                        help="file holding the last synced change number (with --changes)")
+    parser.add_argument('--since', type=int, help="export changes after this number instead of the checkpoint")
+    parser.add_argument('--prune', action='store_true',
+                        help="delete change log entries up to the new checkpoint after exporting")
+    args = parser.parse_args(argv)
+
+    if not args.changes:
+        rows = export_students(args.output, args.db)
+        print(f"✅ {rows} students exported to {args.output}")
+        return
+
+    since = args.since if args.since is not None else read_checkpoint(args.checkpoint)
+    rows, checkpoint = export_changes(args.output, since, args.db)
+    write_checkpoint(args.checkpoint, checkpoint)
+    if args.prune:
+        conn = student_db.connect(args.db)
+        try:
+            student_db.prune_changes(conn, checkpoint)
+        finally:
+            conn.close()
+    print(f"✅ {rows} changed students ({since} -> {checkpoint}) exported to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
+
+# To sync changes nightly:
+# 1. Run: python student_export.py --changes changes.ndjson
+# 2. Each run exports only what changed since the previous one (see students.checkpoint)
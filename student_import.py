@@ -0,0 +1,135 @@
+# Bulk Import for Student Records
+# Author: Ajay Mondal
+# Technologies: Python, SQLite, PyArrow
+
+import argparse
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+import student_db
+
+# Rows read from the file and written to SQLite per transaction
+CHUNK_SIZE = 5000
+
+# Columns taken from the file; ids are assigned by the target database
+IMPORT_COLUMNS = [column for column in student_db.STUDENT_COLUMNS if column != 'id']
+REQUIRED_COLUMNS = ['name', 'roll_number']
+
+# Re-importing a student (same roll number) updates it instead of failing
+UPSERT_QUERY = f'''
+    INSERT INTO students ({', '.join(IMPORT_COLUMNS)})
+    VALUES ({', '.join('?' for _ in IMPORT_COLUMNS)})
+    ON CONFLICT(roll_number) DO UPDATE SET
+        {', '.join(f'{column}=excluded.{column}' for column in IMPORT_COLUMNS
+                   if column not in ('roll_number', 'created_date'))}
+'''
+
+
+def read_csv(filename, chunk_size):
+    with open(filename, newline='', encoding='utf-8') as f:
+        chunk = []
+        for record in csv.DictReader(f):
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def read_ndjson(filename, chunk_size):
+    with open(filename, encoding='utf-8') as f:
+        chunk = []
+        for line in f:
+            if line.strip():
+                chunk.append(json.loads(line))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def read_parquet(filename, chunk_size):
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(filename).iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+
+READERS = {
+    '.csv': read_csv,
+    '.ndjson': read_ndjson,
+    '.jsonl': read_ndjson,
+    '.parquet': read_parquet,
+}
+
+
+def get_reader(filename):
+    """Pick the input reader from the file extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Unsupported import format: {extension or filename}")
+    return READERS[extension]
+
+
+def record_row(record, current_time):
+    """Parameters for UPSERT_QUERY, or None if the record can't be a student"""
+    if any(not record.get(column) for column in REQUIRED_COLUMNS):
+        return None
+    # CSV has no nulls, only empty cells
+    values = {column: None if record.get(column) == '' else record.get(column)
+              for column in IMPORT_COLUMNS}
+    values['created_date'] = values['created_date'] or current_time
+    values['updated_date'] = current_time
+    return tuple(values[column] for column in IMPORT_COLUMNS)
+
+
+def import_students(filename, db_path=student_db.DB_PATH, progress=None, chunk_size=CHUNK_SIZE):
+    """Stream students from a CSV, NDJSON or Parquet file into the database
+
+    Files written by student_export can be imported back. Returns
+    (rows imported, rows skipped); rows without a name or roll number, such
+    as deletions in a change export, are skipped.
+    """
+    reader = get_reader(filename)
+    conn = student_db.connect(db_path)
+    imported = skipped = 0
+    try:
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for records in reader(filename, chunk_size):
+            rows = [record_row(record, current_time) for record in records]
+            valid = [row for row in rows if row is not None]
+            with conn:
+                conn.executemany(UPSERT_QUERY, valid)
+            imported += len(valid)
+            skipped += len(rows) - len(valid)
+            if progress:
+                progress(imported)
+    finally:
+        conn.close()
+    return imported, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import students from a CSV, NDJSON or Parquet file")
+    parser.add_argument('input', help="input file (.csv, .ndjson, .jsonl or .parquet)")
+    parser.add_argument('--db', default=student_db.DB_PATH, help="student database")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    imported, skipped = import_students(args.input, args.db)
+    print(f"✅ {imported:,} students imported from {args.input}"
+          + (f", {skipped:,} rows skipped" if skipped else "")
+          + f" in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
+
+# To import students:
+# 1. Run: python student_import.py students.csv --db student_records.db
+# 2. Rows with an existing roll number update that student
@@ -0,0 +1,233 @@
+# Parallel Batch Reports per Course and Year
+# Author: Ajay Mondal
+# Technologies: Python, SQLite, Matplotlib, multiprocessing
+
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import student_db
+from student_analytics import AT_RISK_ATTENDANCE, AT_RISK_GRADE
+
+REPORT_FORMATS = ['txt', 'png', 'pdf']
+
+# Students listed in the top section of each report (at-risk thresholds come from student_analytics)
+TOP_STUDENTS = 10
+
+# Read-only connection owned by each worker process
+worker_conn = None
+
+
+def open_read_only(db_path):
+    """Connect in read-only mode so workers can never write"""
+    return sqlite3.connect(Path(db_path).resolve().as_uri() + '?mode=ro', uri=True)
+
+
+def init_worker(db_path):
+    """Open this worker's read-only connection"""
+    global worker_conn
+    worker_conn = open_read_only(db_path)
+
+
+def list_groups(conn):
+    """Every (course, year) combination that has students"""
+    return conn.execute('''
+        SELECT course, year FROM student_stats
+        WHERE student_count > 0 ORDER BY course, year
+    ''').fetchall()
+
+
+def report_name(course, year):
+    """File-system friendly base name, e.g. 'B.Tech year 2' -> 'B-Tech_year2'"""
+    safe_course = ''.join(c if c.isalnum() else '-' for c in str(course or 'none'))
+    return f'{safe_course}_year{year}'
+
+
+def report_names(groups):
+    """Base name per (course, year), suffixed with a short hash of the course where names collide
+
+    'B.Tech' and 'B Tech' both clean up to 'B-Tech', and 'BCA' and 'bca' are
+    the same file on case-insensitive file systems.
+    """
+    names = {group: report_name(*group) for group in groups}
+    counts = {}
+    for name in names.values():
+        counts[name.lower()] = counts.get(name.lower(), 0) + 1
+    for (course, year), name in names.items():
+        if counts[name.lower()] > 1:
+            digest = hashlib.sha1(repr(course).encode()).hexdigest()[:6]
+            names[course, year] = f'{name}-{digest}'
+    return names
+
+
+def collect_group_stats(conn, course, year):
+    """Numbers for one course/year report"""
+    count, attendance_sum, attendance_count, grade_sum, grade_count = conn.execute('''
+        SELECT student_count, attendance_sum, attendance_count, grade_sum, grade_count
+        FROM student_stats WHERE course IS ? AND year IS ?
+    ''', (course, year)).fetchone()
+
+    where = 'course IS ? AND year IS ?'
+    top = conn.execute(f'''
+        SELECT roll_number, name, grade, attendance FROM students
+        WHERE {where} AND {student_db.is_positive('grade')}
+        ORDER BY grade DESC LIMIT ?
+    ''', (course, year, TOP_STUDENTS)).fetchall()
+    at_risk = conn.execute(f'''
+        SELECT roll_number, name, grade, attendance FROM students
+        WHERE {where} AND attendance < ? AND grade < ?
+          AND {student_db.is_positive('attendance')} AND {student_db.is_positive('grade')}
+        ORDER BY attendance
+    ''', (course, year, AT_RISK_ATTENDANCE, AT_RISK_GRADE)).fetchall()
+
+    return {
+        'course': course,
+        'year': year,
+        'students': count,
+        'avg_attendance': attendance_sum / attendance_count if attendance_count else 0,
+        'avg_grade': grade_sum / grade_count if grade_count else 0,
+        'attendance_histogram': student_db.bin_column(conn, 'attendance', 10, where, (course, year)),
+        'grade_histogram': student_db.bin_column(conn, 'grade', 1, where, (course, year)),
+        'top': top,
+        'at_risk': at_risk,
+    }
+
+
+def format_text(stats):
+    """Plain-text report for one course/year"""
+    report = f"""COURSE REPORT: {stats['course']} - YEAR {stats['year']}
+Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+=== SUMMARY STATISTICS ===
+Total Students: {stats['students']}
+Average Attendance: {stats['avg_attendance']:.2f}%
+Average Grade: {stats['avg_grade']:.2f}/10
+
+=== TOP {TOP_STUDENTS} STUDENTS ===
+"""
+    for roll_number, name, grade, attendance in stats['top']:
+        report += f"{roll_number}  {name}: grade {grade}, attendance {attendance}%\n"
+
+    report += f"\n=== AT-RISK STUDENTS ({len(stats['at_risk'])}) ===\n"
+    for roll_number, name, grade, attendance in stats['at_risk']:
+        report += f"{roll_number}  {name}: grade {grade}, attendance {attendance}%\n"
+    return report
+
+
+def render_figure(stats):
+    """Attendance and grade histograms for one course/year"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 4))
+    ax1, ax2 = fig.subplots(1, 2)
+    charts = [
+        (ax1, 'attendance', 'Attendance Distribution', 'Attendance %', 'skyblue'),
+        (ax2, 'grade', 'Grade Distribution', 'Grade (0-10)', 'lightgreen'),
+    ]
+    for ax, metric, title, xlabel, color in charts:
+        edges = student_db.histogram_edges(metric)
+        ax.bar(edges[:-1], stats[f'{metric}_histogram'], width=edges[1] - edges[0], align='edge',
+               color=color, edgecolor='black')
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel('Number of Students')
+    fig.suptitle(f"{stats['course']} - Year {stats['year']}")
+    fig.tight_layout()
+    return fig
+
+
+def render_pdf(stats, text):
+    """Text page followed by the charts"""
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    buffer = io.BytesIO()
+    with PdfPages(buffer) as pdf:
+        page = Figure(figsize=(8.27, 11.69))
+        page.text(0.05, 0.95, text, va='top', family='monospace', fontsize=7)
+        pdf.savefig(page)
+        pdf.savefig(render_figure(stats))
+    return buffer.getvalue()
+
+
+def render_group(job):
+    """Worker entry point: build every requested file for one course/year"""
+    course, year, name, formats = job
+    stats = collect_group_stats(worker_conn, course, year)
+    text = format_text(stats)
+
+    files = []
+    if 'txt' in formats:
+        files.append((f'{name}.txt', text.encode('utf-8')))
+    if 'png' in formats:
+        buffer = io.BytesIO()
+        render_figure(stats).savefig(buffer, format='png')
+        files.append((f'{name}.png', buffer.getvalue()))
+    if 'pdf' in formats:
+        files.append((f'{name}.pdf', render_pdf(stats, text)))
+    return files
+
+
+def generate_reports(db_path, output, formats=('txt', 'png'), workers=None):
+    """Render a report per course/year in a process pool into a directory or .zip file"""
+    conn = open_read_only(db_path)
+    try:
+        groups = list_groups(conn)
+    finally:
+        conn.close()
+
+    names = report_names(groups)
+    jobs = [(course, year, names[course, year], tuple(formats)) for course, year in groups]
+    to_zip = output.lower().endswith('.zip')
+    if not to_zip:
+        os.makedirs(output, exist_ok=True)
+
+    written = 0
+    archive = zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) if to_zip else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(db_path,)) as pool:
+            # Files are written by the parent as soon as each group finishes
+            for files in pool.map(render_group, jobs):
+                for filename, data in files:
+                    if archive:
+                        archive.writestr(filename, data)
+                    else:
+                        with open(os.path.join(output, filename), 'wb') as f:
+                            f.write(data)
+                    written += 1
+    finally:
+        if archive:
+            archive.close()
+
+    return len(groups), written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate one report per course and year")
+    parser.add_argument('--db', default=student_db.DB_PATH, help="student database")
+    parser.add_argument('--output', default='reports', help="output directory or .zip file")
+    parser.add_argument('--formats', nargs='+', choices=REPORT_FORMATS, default=['txt', 'png'])
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    groups, written = generate_reports(args.db, args.output, args.formats, args.workers)
+    print(f"✅ {groups} course/year reports ({written} files) written to {args.output} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
+
+# To run batch reports:
+# 1. Run: python student_reports.py --output term_reports.zip --formats txt pdf
@@ -0,0 +1,527 @@
+# Student Records Repository
+# Author: Ajay Mondal
+# Technologies: Python, SQLite (WAL)
+
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+
+import student_archive
+import student_attendance
+import student_db
+import tracing
+
+# Editable student fields, in form order
+STUDENT_FIELDS = ['name', 'roll_number', 'email', 'phone', 'course', 'year', 'attendance', 'grade']
+
+# Writers retry this many times if the lock is still held after the busy timeout
+WRITE_RETRIES = 5
+RETRY_DELAY = 0.05
+
+# Connections shared by all threads, and seconds to wait when all are lent out
+POOL_SIZE = 8
+POOL_TIMEOUT = 10.0
+
+# Upper bounds for the in-memory cache
+MAX_CACHED_RECORDS = 200000
+MAX_CACHED_PAGES = 32
+
+ALL_COLUMNS = ', '.join(student_db.STUDENT_COLUMNS)
+
+# Bulk edits that can be undone, most recent last
+MAX_UNDO = 10
+
+
+class StudentRecord:
+    """One cached students row; __slots__ keeps it to a fixed handful of pointers"""
+
+    __slots__ = student_db.STUDENT_COLUMNS
+
+    def __init__(self, row):
+        for column, value in zip(student_db.STUDENT_COLUMNS, row):
+            setattr(self, column, value)
+
+    def list_row(self):
+        """Values shown in the student list"""
+        return (self.id, self.name, self.roll_number, self.course, self.year,
+                self.attendance, self.grade)
+
+    def as_dict(self):
+        return {column: getattr(self, column) for column in self.__slots__}
+
+
+class StudentCache:
+    """Read-through cache of student records, list pages and aggregates
+
+    Everything in it was read at one database version (student_db.get_data_version),
+    shared by every thread and connection. Data read at another version is
+    not stored.
+    """
+
+    def __init__(self, enabled=True):
+        # A disabled cache stores nothing, so every read goes to SQLite
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        # Least recently stored first, so eviction pops from the front in O(1)
+        self.records = OrderedDict()
+        self.pages = OrderedDict()
+        self.aggregates = {}
+        self.version = None
+
+    def sync(self, version):
+        """Empty the cache if the database has moved on since it was filled"""
+        with self.lock:
+            if version != self.version:
+                self.clear_locked()
+                self.version = version
+
+    def written(self, before, after, student_ids=()):
+        """Account for a write of ours that took the database from version before to after
+
+        It only invalidates what it touched, unless someone else wrote first.
+        """
+        with self.lock:
+            if self.version == before:
+                for student_id in student_ids:
+                    self.records.pop(student_id, None)
+                self.pages.clear()
+                self.aggregates.clear()
+            else:
+                self.clear_locked()
+            self.version = after
+
+    def get(self, student_id):
+        return self.records.get(student_id)
+
+    def put_records(self, records, version):
+        with self.lock:
+            if not self.enabled or version != self.version:
+                return
+            for record in records:
+                self.records[record.id] = record
+                self.records.move_to_end(record.id)
+            # Evict the oldest entries once over the limit
+            while len(self.records) > MAX_CACHED_RECORDS:
+                self.records.popitem(last=False)
+
+    def get_page(self, key):
+        return self.pages.get(key)
+
+    def put_page(self, key, ids, version):
+        with self.lock:
+            if not self.enabled or version != self.version:
+                return
+            self.pages[key] = ids
+            self.pages.move_to_end(key)
+            if len(self.pages) > MAX_CACHED_PAGES:
+                self.pages.popitem(last=False)
+
+    def put_aggregate(self, name, value, version):
+        with self.lock:
+            if self.enabled and version == self.version:
+                self.aggregates[name] = value
+
+    def clear(self):
+        with self.lock:
+            self.clear_locked()
+
+    def clear_locked(self):
+        self.records.clear()
+        self.pages.clear()
+        self.aggregates.clear()
+
+
+class ConnectionLease:
+    """Kept in a thread's local storage; when the thread ends, its connection goes back to the pool"""
+
+    __slots__ = ('conn', 'finalizer', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.finalizer = None
+
+
+class ConnectionPool:
+    """A bounded set of SQLite connections, each lent to one thread at a time
+
+    A thread keeps its connection until it exits; the connection then serves
+    the next thread, so a thread-per-request server reuses a few connections
+    instead of opening one per request.
+    """
+
+    def __init__(self, path=student_db.DB_PATH, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        # Most recently returned first, so the warmest connections get reused
+        self.idle = queue.LifoQueue()
+        self.opened = 0
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.schema_ready = False
+
+    def get(self):
+        """Return this thread's connection, borrowing one on first use"""
+        lease = getattr(self.local, 'lease', None)
+        if lease is None:
+            lease = ConnectionLease(self.acquire())
+            lease.finalizer = weakref.finalize(lease, self.release, lease.conn)
+            self.local.lease = lease
+        return lease.conn
+
+    def acquire(self):
+        """An idle connection, a new one while under the limit, or the next one returned"""
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self.lock:
+            can_open = self.opened < self.size
+            if can_open:
+                self.opened += 1
+        if can_open:
+            try:
+                return self.open()
+            except Exception:
+                with self.lock:
+                    self.opened -= 1
+                raise
+
+        try:
+            return self.idle.get(timeout=POOL_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError(f"All {self.size} database connections are busy") from None
+
+    def open(self):
+        # Connections move between threads, but only one thread uses each at a time
+        conn = student_db.open_connection(self.path, check_same_thread=False)
+        with self.lock:
+            if not self.schema_ready:
+                student_db.init_schema(conn)
+                self.schema_ready = True
+        return conn
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self.idle.put(conn)
+
+    def close(self):
+        """Close this thread's connection instead of returning it to the pool"""
+        lease = getattr(self.local, 'lease', None)
+        if lease is not None:
+            lease.finalizer.detach()
+            lease.conn.close()
+            self.local.lease = None
+            with self.lock:
+                self.opened -= 1
+
+
+def is_locked_error(error):
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+class StudentRepository:
+    """GUI-independent access to student records"""
+
+    def __init__(self, path=student_db.DB_PATH, cache=True):
+        self.pool = ConnectionPool(path)
+        self.cache = StudentCache(cache)
+        self.undo_stack = []
+        # Cohort analytics columns, patched from the change log between reports
+        self.analytics_snapshot = None
+
+    def connection(self):
+        return self.pool.get()
+
+    def check_cache(self):
+        """Empty the cache if anything wrote to the database since it was filled
+
+        Returns the database version, to tag whatever is read next.
+        """
+        if not self.cache.enabled:
+            return None
+        version = student_db.get_data_version(self.connection())
+        self.cache.sync(version)
+        return version
+
+    def write(self, func, student_ids=()):
+        """Run func(conn) in a transaction, retrying while another writer holds the lock
+
+        The transaction takes the write lock up front, so anything func reads
+        (e.g. an undo snapshot) can't change before its writes land.
+        """
+        self.check_cache()
+        for attempt in range(WRITE_RETRIES):
+            conn = self.connection()
+            try:
+                with conn:
+                    conn.execute('BEGIN IMMEDIATE')
+                    before = student_db.get_data_version(conn)
+                    result = func(conn)
+                    after = student_db.get_data_version(conn)
+                break
+            except sqlite3.OperationalError as e:
+                if not is_locked_error(e) or attempt == WRITE_RETRIES - 1:
+                    raise
+                time.sleep(RETRY_DELAY * (2 ** attempt))
+
+        self.cache.written(before, after, student_ids)
+        return result
+
+    # CRUD
+
+    def add_student(self, data):
+        """Insert a student and return the new id"""
+        if not data.get('name') or not data.get('roll_number'):
+            raise ValueError("Name and Roll Number are required!")
+
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        values = [data.get(field) for field in STUDENT_FIELDS] + [current_time, current_time]
+
+        def insert(conn):
+            cursor = conn.execute(f'''
+                INSERT INTO students ({', '.join(STUDENT_FIELDS)}, created_date, updated_date)
+                VALUES ({', '.join('?' * (len(STUDENT_FIELDS) + 2))})
+            ''', values)
+            return cursor.lastrowid
+
+        return self.write(insert)
+
+    def update_student(self, student_id, data):
+        """Update the given fields of a student; returns True if the student exists"""
+        fields = [field for field in STUDENT_FIELDS if field in data and field != 'roll_number']
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        assignments = ', '.join(f'{field}=?' for field in fields + ['updated_date'])
+        values = [data[field] for field in fields] + [current_time, student_id]
+
+        def update(conn):
+            cursor = conn.execute(f'UPDATE students SET {assignments} WHERE id=?', values)
+            return cursor.rowcount > 0
+
+        return self.write(update, [student_id])
+
+    def delete_student(self, student_id):
+        """Delete a student; returns True if a row was removed"""
+        def delete(conn):
+            cursor = conn.execute('DELETE FROM students WHERE id=?', (student_id,))
+            return cursor.rowcount > 0
+
+        return self.write(delete, [student_id])
+
+    def get_student(self, student_id):
+        """Return one student as a dict, or None; archived students are found too"""
+        version = self.check_cache()
+        record = self.cache.get(student_id)
+        if record is None:
+            row = self.connection().execute(
+                f'SELECT {student_db.RECORD_COLUMNS} FROM students s WHERE id=?', (student_id,)
+            ).fetchone()
+            if row is None:
+                row = student_archive.find_archived_student(self.connection(), student_id, self.pool.path)
+            if row is None:
+                return None
+            record = StudentRecord(row)
+            self.cache.put_records([record], version)
+        return record.as_dict()
+
+    # Bulk edits
+
+    def count_students(self, ids=None, text='', course=None, year=None):
+        """How many students a bulk edit with the same arguments would touch"""
+        where, params = student_db.filter_condition(text, course, year, ids)
+        return self.connection().execute(f'SELECT COUNT(*) FROM students WHERE {where}', params).fetchone()[0]
+
+    def bulk_update(self, changes, ids=None, text='', course=None, year=None):
+        """Set the same fields on every matching student in one UPDATE; returns the row count"""
+        fields = [field for field in STUDENT_FIELDS if field in changes and field != 'roll_number']
+        if not fields:
+            raise ValueError("Nothing to update!")
+
+        where, params = student_db.filter_condition(text, course, year, ids)
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        assignments = ', '.join(f'{field}=?' for field in fields + ['updated_date'])
+        values = [changes[field] for field in fields] + [current_time]
+
+        def update(conn):
+            # Keep the old rows so the edit can be undone
+            before = conn.execute(f'SELECT {ALL_COLUMNS} FROM students WHERE {where}', params).fetchall()
+            conn.execute(f'UPDATE students SET {assignments} WHERE {where}', values + params)
+            return before
+
+        before = self.write(update)
+        self.cache.clear()
+        self.push_undo(f"update of {len(before)} students", 'update', before, [])
+        return len(before)
+
+    def bulk_delete(self, ids=None, text='', course=None, year=None):
+        """Delete every matching student in one DELETE; returns the row count"""
+        where, params = student_db.filter_condition(text, course, year, ids)
+
+        def delete(conn):
+            before = conn.execute(f'SELECT {ALL_COLUMNS} FROM students WHERE {where}', params).fetchall()
+            attendance = conn.execute(f'''
+                SELECT student_id, day, status FROM attendance_days
+                WHERE student_id IN (SELECT id FROM students WHERE {where})
+            ''', params).fetchall()
+            conn.execute(f'DELETE FROM students WHERE {where}', params)
+            return before, attendance
+
+        before, attendance = self.write(delete)
+        self.cache.clear()
+        self.push_undo(f"deletion of {len(before)} students", 'delete', before, attendance)
+        return len(before)
+
+    def push_undo(self, description, kind, rows, attendance):
+        if not rows:
+            return
+        self.undo_stack.append((description, kind, rows, attendance))
+        del self.undo_stack[:-MAX_UNDO]
+
+    def undo_description(self):
+        """What undo_last() would revert, or None"""
+        return self.undo_stack[-1][0] if self.undo_stack else None
+
+    def undo_last(self):
+        """Restore the rows changed by the most recent bulk edit; returns its description"""
+        if not self.undo_stack:
+            return None
+        description, kind, rows, attendance = self.undo_stack[-1]
+        columns = student_db.STUDENT_COLUMNS
+        placeholders = ', '.join('?' * len(columns))
+        attendance_index = columns.index('attendance')
+
+        def restore(conn):
+            if kind == 'update':
+                assignments = ', '.join(f'{column}=?' for column in columns[1:])
+                conn.executemany(f'UPDATE students SET {assignments} WHERE id=?',
+                                 [row[1:] + row[:1] for row in rows])
+            else:
+                conn.executemany(f'INSERT INTO students ({ALL_COLUMNS}) VALUES ({placeholders})', rows)
+                # Replaying the roll calls rebuilds attendance totals through the triggers
+                conn.executemany('INSERT INTO attendance_days (student_id, day, status) VALUES (?, ?, ?)',
+                                 attendance)
+                conn.executemany('UPDATE students SET attendance=? WHERE id=?',
+                                 [(row[attendance_index], row[0]) for row in rows])
+
+        self.write(restore)
+        self.cache.clear()
+        self.undo_stack.pop()
+        return description
+
+    # Attendance
+
+    def mark_class(self, day, course, year, absent=(), late=()):
+        """Take roll call for a course/year section
+
+        Returns (students marked, unknown roll numbers); nothing is written if
+        any roll number isn't in the section.
+        """
+        def mark(conn):
+            statuses, unknown = student_attendance.class_statuses(conn, course, year, absent, late)
+            if unknown:
+                return 0, unknown
+            return student_attendance.write_marks(conn, day, statuses), unknown
+
+        marked, unknown = self.write(mark)
+        if marked:
+            # The triggers rewrote attendance on every marked student
+            self.cache.clear()
+        return marked, unknown
+
+    # Archives
+
+    def archive_students(self, label, text='', course=None, year=None, inactive_before=None):
+        """Move matching students into the named archive file; returns how many moved"""
+        conn = self.connection()
+        moved = student_archive.archive_students(conn, label, self.pool.path, text, course, year,
+                                                 inactive_before)
+        self.check_cache()
+        return moved
+
+    # Queries
+
+    @tracing.traced()
+    def search(self, text='', course=None, year=None, limit=student_db.PAGE_SIZE, offset=0,
+               include_archived=False):
+        """Return list rows matching the search text and filters
+
+        Only bounded pages go through the cache; a full listing (limit None
+        or negative) is read straight from SQLite.
+        """
+        version = self.check_cache()
+        cacheable = limit is not None and limit >= 0
+        key = (text, course, year, limit, offset, include_archived)
+        ids = self.cache.get_page(key) if cacheable else None
+        if ids is not None:
+            records = [self.cache.get(student_id) for student_id in ids]
+            if all(records):
+                return [record.list_row() for record in records]
+
+        # Uncached listings only need the list columns
+        columns = student_db.RECORD_COLUMNS if cacheable else student_db.LIST_COLUMNS
+        if include_archived:
+            rows = student_archive.search_with_archives(self.connection(), text, course, year, limit, offset,
+                                                        self.pool.path, columns=columns)
+        else:
+            rows = student_db.search_students(self.connection(), text, course, year, limit, offset,
+                                              columns=columns)
+        if not cacheable:
+            return rows
+        records = [StudentRecord(row) for row in rows]
+        self.cache.put_records(records, version)
+        self.cache.put_page(key, [record.id for record in records], version)
+        return [record.list_row() for record in records]
+
+    def cached_aggregate(self, name, compute):
+        """Return a report/analytics result, recomputing it only after changes"""
+        version = self.check_cache()
+        value = self.cache.aggregates.get(name)
+        if value is None:
+            value = compute(self.connection())
+            self.cache.put_aggregate(name, value, version)
+        return value
+
+    def report(self):
+        """Return summary statistics and the course distribution"""
+        def compute(conn):
+            report = student_db.get_summary(conn)
+            report['courses'] = student_db.get_course_counts(conn)
+            return report
+
+        return dict(self.cached_aggregate('report', compute))
+
+    def analytics(self):
+        """Return the numbers behind the dashboard charts"""
+        def compute(conn):
+            return {
+                'courses': student_db.get_course_counts(conn),
+                'years': student_db.get_year_counts(conn),
+                'attendance_histogram': student_db.get_histogram(conn, 'attendance'),
+                'grade_histogram': student_db.get_histogram(conn, 'grade'),
+            }
+
+        return dict(self.cached_aggregate('analytics', compute))
+
+    def cohort_analytics(self):
+        """Percentiles, correlation, at-risk list and ranks per course/year cohort"""
+        import student_analytics
+
+        if self.analytics_snapshot is None:
+            self.analytics_snapshot = student_analytics.ColumnSnapshot()
+
+        def compute(conn):
+            return student_analytics.compute_cohort_analytics(self.analytics_snapshot.load(conn))
+
+        return self.cached_aggregate('cohort', compute)
+
+    def cohort_report(self):
+        """Cohort analytics formatted for the text report"""
+        import student_analytics
+
+        return student_analytics.format_report(self.cohort_analytics())
@@ -0,0 +1,263 @@
+# Tracing and Sampling Profiler for the Portfolio Apps
+# Author: Ajay Mondal
+# Technologies: Python, threading, Chrome trace-event format
+
+import argparse
+import atexit
+import collections
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# Spans kept in memory; the oldest are dropped first in long runs
+MAX_EVENTS = 200000
+
+# Seconds between stack samples in profiler mode
+SAMPLE_INTERVAL = 0.005
+
+# Setting TRACE=trace.json turns tracing on and writes the trace on exit;
+# TRACE_PROFILE=profile.folded also samples stacks for TRACE_PROFILE_SECONDS
+TRACE_ENV = 'TRACE'
+PROFILE_ENV = 'TRACE_PROFILE'
+PROFILE_SECONDS_ENV = 'TRACE_PROFILE_SECONDS'
+
+enabled = False
+events = collections.deque(maxlen=MAX_EVENTS)
+thread_names = {}
+ORIGIN_NS = time.perf_counter_ns()
+
+
+class Span:
+    """Times a block and records it as a Chrome 'complete' event"""
+
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        thread = threading.current_thread()
+        thread_names[thread.ident] = thread.name
+        event = {
+            'name': self.name,
+            'ph': 'X',
+            'ts': (self.start - ORIGIN_NS) / 1000,
+            'dur': (end - self.start) / 1000,
+            'pid': os.getpid(),
+            'tid': thread.ident,
+        }
+        if self.args or exc_type:
+            event['args'] = dict(self.args, error=exc_type.__name__) if exc_type else self.args
+        events.append(event)
+        return False
+
+
+class NullSpan:
+    """Shared do-nothing span used while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+def span(name, **args):
+    """Context manager timing a block: with tracing.span('fit', rows=n): ..."""
+    if not enabled:
+        return NULL_SPAN
+    return Span(name, args)
+
+
+def traced(name=None):
+    """Decorator timing every call of a function under name (default: its qualified name)"""
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # One global lookup when tracing is off
+            if not enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def enable(path=None):
+    """Start recording spans; with a path, write them there when the process exits"""
+    global enabled
+    enabled = True
+    if path:
+        atexit.register(write_trace, path)
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def trace_events():
+    """Recorded spans plus the thread-name metadata Chrome and Perfetto show"""
+    metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+                for tid, name in list(thread_names.items())]
+    return metadata + list(events)
+
+
+def write_trace(path):
+    """Write the spans in Chrome trace-event JSON (open in chrome://tracing or ui.perfetto.dev)"""
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'traceEvents': trace_events(), 'displayTimeUnit': 'ms'}, f)
+    os.replace(path + '.tmp', path)
+    return path
+
+
+class Profiler:
+    """Sample every thread's stack on a background thread for a time window
+
+    Samples are counted per call stack and written in the folded format
+    ("outer;inner;leaf count") read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, seconds=None, path=None):
+        self.interval = interval
+        self.seconds = seconds
+        self.path = path
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='tracing-profiler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join()
+        return self
+
+    def run(self):
+        deadline = time.monotonic() + self.seconds if self.seconds else None
+        own_ident = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    self.stacks[self.fold(names.get(ident, ident), frame)] += 1
+            self.samples += 1
+            if deadline and time.monotonic() >= deadline:
+                break
+        if self.path:
+            self.write(self.path)
+
+    @staticmethod
+    def fold(thread_name, frame):
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        frames.append(str(thread_name))
+        return ';'.join(reversed(frames))
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+        return path
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+def profile(seconds, path, interval=SAMPLE_INTERVAL):
+    """Sample stacks for the next `seconds` and write flame-graph data to path"""
+    profiler = Profiler(interval, seconds, path).start()
+    # Exiting early still writes what was sampled so far
+    atexit.register(profiler.stop)
+    return profiler
+
+
+def peak_rss_mb(children=False):
+    """Peak resident set size in MB of this process (or its largest finished child), None if unknown"""
+    try:
+        import resource
+    except ImportError:
+        # No getrusage on Windows; psutil reports this process's peak working set there
+        if children:
+            return None
+        try:
+            import psutil
+        except ImportError:
+            return None
+        peak = getattr(psutil.Process().memory_info(), 'peak_wset', None)
+        return None if peak is None else round(peak / (1024 * 1024), 1)
+
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS but KiB on Linux and the BSDs
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def summarize(trace):
+    """Count, total and slowest duration (ms) per span name, slowest total first"""
+    totals = {}
+    for event in trace['traceEvents']:
+        if event.get('ph') != 'X':
+            continue
+        count, total, slowest = totals.get(event['name'], (0, 0.0, 0.0))
+        duration = event['dur'] / 1000
+        totals[event['name']] = (count + 1, total + duration, max(slowest, duration))
+    return sorted(totals.items(), key=lambda item: -item[1][1])
+
+
+def enable_from_environment():
+    if os.environ.get(TRACE_ENV):
+        enable(os.environ[TRACE_ENV])
+    if os.environ.get(PROFILE_ENV):
+        profile(float(os.environ.get(PROFILE_SECONDS_ENV, 30)), os.environ[PROFILE_ENV])
+
+
+enable_from_environment()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a Chrome trace written by tracing.py")
+    parser.add_argument('trace', help="trace .json file")
+    args = parser.parse_args(argv)
+
+    with open(args.trace) as f:
+        trace = json.load(f)
+    print(f"{'span':<45}{'calls':>8}{'total ms':>12}{'max ms':>10}")
+    for name, (count, total, slowest) in summarize(trace):
+        print(f"{name[:44]:<45}{count:>8}{total:>12.1f}{slowest:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
+
+# To trace a run:
+# 1. Run any app with TRACE set: TRACE=trace.json python student-management.py
+# 2. Open trace.json in chrome://tracing or https://ui.perfetto.dev
+# 3. Or summarize it: python tracing.py trace.json
+# 4. Flame graph of the first minute: TRACE_PROFILE=profile.folded TRACE_PROFILE_SECONDS=60 python ml-price-predictor.py